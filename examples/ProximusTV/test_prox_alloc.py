@@ -0,0 +1,52 @@
+"""
+  test_prox_alloc.py test example for the PT6302 VFD Driver.
+
+  - Focus: Check that steady-state refreshes do not allocate memory (no GC pauses).
+  - VFD Model: Proximus TV/Belgacom TV  Vaccum Fluorescent Display
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from vfd_proximus import *
+from machine import Pin
+import gc
+
+d = VFD_Proximus( sck_pin=Pin.board.GP16, sdata_pin=Pin.board.GP13, cs_pin=Pin.board.GP14, reset_pin=Pin.board.GP18 )
+text = bytearray( b"Counter     " )
+d.options += CLOCK
+
+def refresh( i ):
+	text[8] = 0x30 + (i // 100) % 10 # text as bytearray
+	text[9] = 0x30 + (i // 10) % 10
+	text[10] = 0x30 + i % 10
+	with d.batch():
+		d.display_digit( 4, text )
+		d.left.int( i )
+		d.center.fixed( i )
+		d.right.set( i % 100 )
+		d.update()
+
+refresh( 0 ) # warm-up
+gc.collect()
+before = gc.mem_alloc()
+for i in range( 1, 200 ):
+	refresh( i )
+after = gc.mem_alloc()
+print( "Allocated during 200 refreshes: %i bytes" % (after-before) )
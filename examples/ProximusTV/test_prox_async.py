@@ -0,0 +1,59 @@
+"""
+  test_prox_async.py test example for the PT6302 VFD Driver.
+
+  - Focus: asyncio refresh task: many coroutines update the display, one bus write per frame.
+  - VFD Model: Proximus TV/Belgacom TV  Vaccum Fluorescent Display
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from vfd_proximus import *
+from vfd_async import Refresher
+from machine import Pin
+import asyncio
+
+d = VFD_Proximus( sck_pin=Pin.board.GP16, sdata_pin=Pin.board.GP13, cs_pin=Pin.board.GP14, reset_pin=Pin.board.GP18 )
+
+async def counter():
+	i = 0
+	while True:
+		d.left.int( i % 20000 ) # only marks the panel as changed
+		i += 1
+		await asyncio.sleep_ms( 5 )
+
+async def blinker():
+	while True:
+		d.options += CLOCK
+		await asyncio.sleep_ms( 500 )
+		d.options -= CLOCK
+		await asyncio.sleep_ms( 500 )
+
+async def main():
+	refresher = Refresher( d, fps=20 ) # 20 frames per seconds
+	refresher.start()
+	asyncio.create_task( counter() )
+	asyncio.create_task( blinker() )
+	d.print( "Async" )
+	await d.flushed() # wait until the text is on the display
+	print( "Text displayed" )
+	await asyncio.sleep( 10 )
+	refresher.stop()
+
+asyncio.run( main() )
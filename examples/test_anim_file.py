@@ -0,0 +1,48 @@
+"""
+  test_anim_file.py test example for the PT6302 VFD Driver.
+
+  - Focus: Play an animation file streamed from the filesystem (compiled with tools/vfd_animc.py).
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+# Compile the animation on the computer then copy it on the board:
+#    python3 tools/vfd_animc.py tools/anim_intro.py intro.pta
+#    mpremote cp intro.pta :intro.pta
+
+from machine import Pin
+from vfd_pt63 import VFD_PT6302
+from vfd_anim import AnimationPlayer
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
+_cs = Pin( Pin.board.GP14, Pin.OUT, value=True ) # unactiva
+_sdata = Pin( Pin.board.GP13, Pin.OUT )
+_sck = Pin( Pin.board.GP16, Pin.OUT, value=True )
+
+vfd =VFD_PT6302( sck=_sck, sdata=_sdata, cs=_cs, reset=_reset )
+
+player = AnimationPlayer( vfd, "intro.pta" )
+print( "%i frames" % player.frames )
+player.play( loops=2 ) # the file is read frame by frame
+player.close()
+
+# The driver shadow is up to date: only the changes are sent
+vfd.display_digit( 4, "Ready       " )
@@ -0,0 +1,58 @@
+"""
+  test_animation.py test example for the PT6302 VFD Driver.
+
+  - Focus: Page-flip animation: frames stored in CGRAM, played by rewriting the digit pointer only.
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from machine import Pin
+from vfd_pt63 import VFD_PT6302, RAM0, RAM1, RAM2, RAM3
+import time
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
+_cs = Pin( Pin.board.GP14, Pin.OUT, value=True ) # unactiva
+_sdata = Pin( Pin.board.GP13, Pin.OUT )
+_sck = Pin( Pin.board.GP16, Pin.OUT, value=True )
+
+vfd =VFD_PT6302( sck=_sck, sdata=_sdata, cs=_cs, reset=_reset )
+
+# A busy spinner: | / - \
+SPINNER = [
+	[ 0b00100, 0b00100, 0b00100, 0b00100, 0b00100, 0b00100, 0b00100 ],
+	[ 0b00001, 0b00010, 0b00010, 0b00100, 0b01000, 0b01000, 0b10000 ],
+	[ 0b00000, 0b00000, 0b00000, 0b11111, 0b00000, 0b00000, 0b00000 ],
+	[ 0b10000, 0b01000, 0b01000, 0b00100, 0b00010, 0b00010, 0b00001 ] ]
+
+vfd.display_digit( 5, "Loading" )
+# Frames are uploaded once into RAM0..RAM3
+spinner = vfd.animation( 4, SPINNER, [RAM0, RAM1, RAM2, RAM3] )
+spinner.show( 0 )
+
+# Manual playback: each frame only sends 2 bytes
+for i in range( 40 ):
+	spinner.next()
+	time.sleep_ms( 50 )
+
+# Timer playback at 20 frames per second
+spinner.play( fps=20 )
+time.sleep( 5 )
+spinner.stop()
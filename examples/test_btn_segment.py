@@ -37,6 +37,30 @@ import time
 
 VFD_DIGIT = 2  # Digit to be tested. Index from 1..16. 
 
+# --- display interface -------------------------------------
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
+_cs = Pin( Pin.board.GP14, Pin.OUT, value=True ) # unactiva
+_sdata = Pin( Pin.board.GP13, Pin.OUT )
+_sck = Pin( Pin.board.GP16, Pin.OUT, value=True )
+
+vfd =VFD_PT6302( sck=_sck, sdata=_sdata, cs=_cs, reset=_reset, digits=15 )
+# Commands queued from the interrupt handlers, applied with micropython.schedule()
+vfd.irq_queue( size=32 )
+
+# Attach a digit to custom char. Allow to control symbols
+segments = vfd.attach_digit( VFD_DIGIT, RAM7 ) 
+
+# Text "D  2 Seg  0" updated in place (no allocation in the interrupt handler)
+text = bytearray( b"D %2i Seg  0" % VFD_DIGIT )
+
+def show_segment():
+	text[9] = 0x30 + segment_idx // 10 if segment_idx >= 10 else 0x20
+	text[10] = 0x30 + segment_idx % 10
+	vfd.queue_text( 4, text ) # print for position 4
+	segments.queue_clear()
+	segments.queue_set( segment_idx, True )
+
 # --- button interface --------------------------------------
 last_ms = time.ticks_ms()
 segment_idx = 0
@@ -47,6 +71,7 @@ def cb_less(pin):
 	if time.ticks_diff( _now, last_ms )>300:
 		if segment_idx>0:
 			segment_idx -= 1
+			show_segment()
 		last_ms = _now
 
 def cb_more(pin):
@@ -55,41 +80,19 @@ def cb_more(pin):
 	if time.ticks_diff( _now, last_ms )>300:
 		if segment_idx<34:
 			segment_idx += 1
+			show_segment()
 		last_ms = _now
 
 
 # Setup the button input pin with a pull-up resistor.
 btn_less = Pin( Pin.board.GP0 , Pin.IN, Pin.PULL_UP)
 btn_more = Pin( Pin.board.GP1 , Pin.IN, Pin.PULL_UP)
-# Register an interrupt on rising button input.
-btn_less.irq(cb_less, Pin.IRQ_RISING)
-btn_more.irq(cb_more, Pin.IRQ_RISING)
-
-# --- display interface -------------------------------------
-
-_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
-_cs = Pin( Pin.board.GP14, Pin.OUT, value=True ) # unactiva
-_sdata = Pin( Pin.board.GP13, Pin.OUT )
-_sck = Pin( Pin.board.GP16, Pin.OUT, value=True )
-
-vfd =VFD_PT6302( sck=_sck, sdata=_sdata, cs=_cs, reset=_reset, digits=15 )
-
-# Attach a digit to custom char. Allow to control symbols
-segments = vfd.attach_digit( VFD_DIGIT, RAM7 ) 
+# Register a hard interrupt on rising button input. The display is updated by the handlers.
+btn_less.irq(cb_less, Pin.IRQ_RISING, hard=True)
+btn_more.irq(cb_more, Pin.IRQ_RISING, hard=True)
 
-last_segment_idx = None
+show_segment()
 while True:
-	# Did the segment value changed ?
-	if last_segment_idx != segment_idx:
-		s = "D %2i Seg %2i" % (VFD_DIGIT, segment_idx )
-		# Display on REPL
-		print( s )
-		# Display on VFD 
-		vfd.display_digit(4, s) # print for position 1 with auto_increment
-		# Update the segment
-		segments.clear()
-		segments.set(segment_idx, True )
-		segments.update()
-		# Remember
-		last_segment_idx = segment_idx 
-	time.sleep_ms(100)
\ No newline at end of file
+	# Nothing to poll: the main loop is free for other tasks
+	print( "D %2i Seg %2i" % (VFD_DIGIT, segment_idx ) )
+	time.sleep_ms(1000)
@@ -0,0 +1,54 @@
+"""
+  test_bus.py test example for the PT6302 VFD Driver.
+
+  - Focus: Several PT6302 displays on a shared CLKB/DIN bus (one CSB line per display).
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from machine import Pin
+from vfd_bus import PT6302Bus
+import time
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive (shared by the displays)
+_sdata = Pin( Pin.board.GP13, Pin.OUT )
+_sck = Pin( Pin.board.GP16, Pin.OUT, value=True )
+# One CSB line per display
+_cs = [ Pin( Pin.board.GP14, Pin.OUT, value=True ), Pin( Pin.board.GP15, Pin.OUT, value=True ) ]
+
+# The initialization is broadcasted to both displays (all the CSB lines asserted together)
+bus = PT6302Bus( _sck, _sdata, _cs, reset=_reset, digits=15 )
+
+# Same custom char in both displays, a single frame
+bus.define_char( 0, [ 0b00000, 0b01010, 0b11111, 0b11111, 0b01110, 0b00100, 0b00000 ] )
+
+for i in range( 100 ):
+	with bus.batch(): # one frame per display for the changes
+		bus[0].display_digit( 1, "Left  %4i" % i )
+		bus[1].display_digit( 1, "Right %4i" % (100-i) )
+		bus[1].display_digit( 15, 0 ) # custom char
+	time.sleep_ms( 100 )
+
+for duty in range( 8, 0, -1 ): # broadcasted
+	bus.display_duty( duty )
+	time.sleep_ms( 300 )
+bus.display_duty( 7 )
+bus.clear()
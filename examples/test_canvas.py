@@ -0,0 +1,46 @@
+"""
+  test_canvas.py test example for the PT6302 VFD Driver.
+
+  - Focus: Scroll a long text across two displays (virtual canvas with a viewport).
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from machine import Pin
+from vfd_bus import PT6302Bus
+from vfd_canvas import Canvas
+import time
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive (shared by the displays)
+_sdata = Pin( Pin.board.GP13, Pin.OUT )
+_sck = Pin( Pin.board.GP16, Pin.OUT, value=True )
+_cs = [ Pin( Pin.board.GP14, Pin.OUT, value=True ), Pin( Pin.board.GP15, Pin.OUT, value=True ) ]
+
+bus = PT6302Bus( _sck, _sdata, _cs, reset=_reset, digits=15 )
+
+# The viewport covers the 2 x 15 digits, the canvas is 64 chars wide and loops
+canvas = Canvas( bus, width=64, wrap=True )
+canvas.write( 0, "Two PT6302 displays, one long canvas scrolling across the chips! " )
+
+while True:
+	canvas.scroll( 1 )
+	canvas.refresh() # only the changed chars are sent to each chip
+	time.sleep_ms( 200 )
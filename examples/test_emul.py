@@ -0,0 +1,46 @@
+"""
+  test_emul.py test example for the PT6302 VFD Driver.
+
+  - Focus: Run the library on a computer (CPython) with the PT6302 emulator as transport.
+  - VFD Model: Proximus TV/Belgacom TV (no hardware needed)
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+# Run from the repository root with: python3 examples/test_emul.py
+import sys
+sys.path.insert( 0, 'lib' )
+
+from vfd_emul import PT6302Emulator
+from vfd_proximus import *
+
+emul = PT6302Emulator()
+d = VFD_Proximus( sck_pin=None, sdata_pin=None, cs_pin=None, transport=emul )
+d.print( "Emulated" )
+d.options += CLOCK
+d.left.int( 42 )
+d.update()
+
+print( "Text       :", repr( emul.text(4, 12) ) )
+print( "Duty       :", emul.duty )
+print( "Digits     :", emul.digits )
+print( "Digit 3    :", sorted( emul.segments(3) ) )
+print( "CS frames  :", emul.frame_count )
+print( "Bytes sent :", emul.byte_count )
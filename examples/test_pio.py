@@ -0,0 +1,42 @@
+"""
+  test_pio.py test example for the PT6302 VFD Driver.
+
+  - Focus: Send the commands with a rp2 PIO state machine + DMA (non blocking).
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from machine import Pin
+from vfd_pt63 import VFD_PT6302
+from vfd_pio import PIOTransport
+import time
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
+
+# State Machine 0 handles CLKB (GP16), DIN (GP13) and CSB (GP14)
+_pio = PIOTransport( 0, sck=16, sdata=13, cs=14, dma=True )
+vfd =VFD_PT6302( sck=None, sdata=None, cs=None, reset=_reset, transport=_pio )
+
+start = time.ticks_us()
+vfd.display_digit( 4, "PIO and DMA " )
+print( "display_digit() returned after %i us" % time.ticks_diff(time.ticks_us(), start) )
+_pio.wait() # Wait for the end of DMA transfer
+print( "frame sent after %i us" % time.ticks_diff(time.ticks_us(), start) )
@@ -0,0 +1,41 @@
+"""
+  test_spi.py test example for the PT6302 VFD Driver.
+
+  - Focus: Send the commands with the hardware SPI bus instead of bit-banging.
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from machine import Pin, SPI
+from vfd_pt63 import VFD_PT6302
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
+_cs = Pin( Pin.board.GP14, Pin.OUT, value=True ) # unactiva
+
+# CLKB on SCK (GP10), DIN on MOSI (GP11). The PT6302 clock must stay under 1 MHz.
+# Mode 3: clock idle high, data acquired on rising edge.
+# rp2 port cannot shift LSB first --> SPI.MSB + spi_lsb=False (library reverse the bits)
+_spi = SPI( 1, baudrate=500_000, polarity=1, phase=1, firstbit=SPI.MSB, sck=Pin(Pin.board.GP10), mosi=Pin(Pin.board.GP11) )
+
+vfd =VFD_PT6302( sck=None, sdata=None, cs=_cs, reset=_reset, spi=_spi, spi_lsb=False )
+
+# First character of the display is at Digit #4
+vfd.display_digit( 4, "SPI transfer" )
@@ -0,0 +1,50 @@
+"""
+  test_thread.py test example for the PT6302 VFD Driver.
+
+  - Focus: Send the frames from the second core (RP2040) so the main loop is not stalled by the bus.
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from machine import Pin
+from vfd_pt63 import VFD_PT6302, PinTransport
+from vfd_thread import ThreadedTransport, BLOCK
+import time
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
+_cs = Pin( Pin.board.GP14, Pin.OUT, value=True ) # unactiva
+_sdata = Pin( Pin.board.GP13, Pin.OUT )
+_sck = Pin( Pin.board.GP16, Pin.OUT, value=True )
+
+# The bit-banging runs on core 1, the frames are queued in a 512 bytes ring
+_thread_transport = ThreadedTransport( PinTransport( _sck, _sdata, _cs ), size=512, policy=BLOCK )
+vfd =VFD_PT6302( sck=None, sdata=None, cs=None, reset=_reset, transport=_thread_transport )
+
+# Sensor loop: the display calls return without waiting for the bus
+for i in range( 1000 ):
+	start = time.ticks_us()
+	vfd.display_digit( 4, "Count %6i" % i )
+	print( "display_digit() returned after %i us" % time.ticks_diff(time.ticks_us(), start) )
+	time.sleep_ms( 10 )
+	if _thread_transport.lost(): # only with DROP_OLDEST policy
+		vfd.resync()
+
+_thread_transport.stop() # send the queued frames then stop the worker
@@ -0,0 +1,39 @@
+"""
+  test_viper.py test example for the PT6302 VFD Driver.
+
+  - Focus: Optimized bit-banging (viper code) when no SPI block is available.
+  - VFD Model: all
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from machine import Pin
+from vfd_pt63 import VFD_PT6302
+from vfd_viper import ViperTransport
+
+_reset = Pin(Pin.board.GP18, Pin.OUT, value=True ) # Unactive
+
+# GPIO numbers for CLKB, DIN, CSB. Timings: 500ns clock low/high, 8us between bytes
+_bb = ViperTransport( sck=16, sdata=13, cs=14, half_ns=500, gap_us=8 )
+vfd =VFD_PT6302( sck=None, sdata=None, cs=None, reset=_reset, transport=_bb )
+
+for i in range( 100 ):
+	vfd.display_digit( 4, "Viper %5i" % i )
+print( "Measured bit rate: %i bits/s" % _bb.bitrate() )
@@ -0,0 +1,111 @@
+"""
+  vfd_anim.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It plays animation files (compiled on a computer with tools/vfd_animc.py) by streaming
+          them from the filesystem, frame by frame.
+
+  File format (little endian):
+    header  : b'PTA1', frame count (uint16)
+    frame   : duration in ms (uint16), command count (uint8), commands
+    command : length (uint8), PT6302 command bytes (DCRAM, CGRAM or control command)
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import time
+
+MAGIC = b'PTA1'
+_HEADER_SIZE = 6
+_CMD_MAX = 64 # longest command (CGRAM write of the 8 chars = 41 bytes)
+
+class AnimationPlayer:
+	""" Stream an animation file to a VFD_PT6302. Each command is read with readinto() in a
+	    reusable buffer then sent with send_cmd(), the commands of a frame are sent in a single
+	    batch (DCRAM and CGRAM shadow/cache are kept up to date). """
+	def __init__( self, vfd, filename ):
+		self.vfd = vfd
+		self.file = open( filename, 'rb' )
+		self._buf = bytearray( _CMD_MAX )
+		_mv = memoryview( self._buf )
+		self._views = [ _mv[:n] for n in range(_CMD_MAX+1) ]
+		self._read( _HEADER_SIZE )
+		if self._buf[0:4] != MAGIC:
+			raise ValueError( "not an animation file" )
+		self.frames = self._buf[4] | (self._buf[5] << 8) # frame count
+		self.index = 0 # next frame
+
+	def _read( self, size ):
+		# Read size bytes at the beginning of the buffer
+		if self.file.readinto( self._views[size] ) != size:
+			raise EOFError( "truncated animation file" )
+
+	def rewind( self ):
+		""" Restart from the first frame """
+		self.file.seek( _HEADER_SIZE )
+		self.index = 0
+
+	def step( self ):
+		""" Send the next frame and return its duration (ms), -1 at the end of the animation """
+		if self.index >= self.frames:
+			return -1
+		_buf = self._buf
+		self._read( 3 )
+		_ms = _buf[0] | (_buf[1] << 8)
+		_count = _buf[2]
+		with self.vfd.batch():
+			for i in range( _count ):
+				self._read( 1 )
+				_len = _buf[0]
+				self._read( _len )
+				self.vfd.send_cmd( self._views[_len] )
+		self.index += 1
+		return _ms
+
+	def play( self, loops=1 ):
+		""" Play the animation (blocking), loops=0 plays it forever """
+		while True:
+			_start = time.ticks_ms()
+			_ms = self.step()
+			if _ms < 0:
+				loops -= 1
+				if loops == 0:
+					return
+				self.rewind()
+				continue
+			_wait = _ms - time.ticks_diff( time.ticks_ms(), _start )
+			if _wait > 0:
+				time.sleep_ms( _wait )
+
+	async def run( self, loops=1 ):
+		""" Play the animation within an asyncio task, loops=0 plays it forever """
+		try:
+			import asyncio
+		except ImportError:
+			import uasyncio as asyncio
+		while True:
+			_ms = self.step()
+			if _ms < 0:
+				loops -= 1
+				if loops == 0:
+					return
+				self.rewind()
+				continue
+			await asyncio.sleep( _ms / 1000 )
+
+	def close( self ):
+		self.file.close()
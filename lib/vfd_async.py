@@ -0,0 +1,81 @@
+"""
+  vfd_async.py is an asyncio refresh scheduler for the PT6302 VFD driver (Vaccum Fluorescent Display).
+
+          The Refresher keeps the display in batch mode: the setters (display_digit, define_char,
+          panels, options, ...) only update the shadow of the display memory. A task sends the
+          changes once per frame, so many updates between two frames become a single bus write.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+try:
+	import asyncio
+except ImportError:
+	import uasyncio as asyncio
+
+class Refresher:
+	""" Flush the VFD_PT6302 (or VFD_Proximus) changes at a fixed frame rate """
+	def __init__( self, vfd, fps=20, segments=True ):
+		""" vfd : the VFD_PT6302 driver. fps : frames per seconds.
+		    segments : also update the DigitSegments created with attach_digit() (panels) at each frame,
+		               so their update() method does not need to be called. """
+		assert 1 <= fps <= 100
+		self.vfd = vfd
+		self.fps = fps
+		self.segments = segments
+		self._period = 1 / fps
+		self._event = asyncio.Event()
+		self._task = None
+
+	def start( self ):
+		""" Enter the batch mode and create the refresh task """
+		if self._task == None:
+			self.vfd.refresher = self
+			self.vfd.__enter__() # batch mode until stop()
+			self._task = asyncio.create_task( self.run() )
+		return self._task
+
+	def stop( self ):
+		""" Cancel the refresh task and leave the batch mode (pending changes are sent) """
+		if self._task != None:
+			self._task.cancel()
+			self._task = None
+			self.vfd.refresher = None
+			if self.segments: # panel changes made since the last frame
+				self.vfd.update_segments()
+			self.vfd.__exit__( None, None, None )
+			self._event.set()
+			self._event.clear()
+
+	def refresh( self ):
+		""" Send the pending changes and wake-up the flushed() waiters """
+		if self.segments:
+			self.vfd.update_segments()
+		self.vfd.flush()
+		self._event.set()
+		self._event.clear()
+
+	async def run( self ):
+		while True:
+			await asyncio.sleep( self._period )
+			self.refresh()
+
+	async def flushed( self ):
+		""" Wait for the next frame (all the changes made before the call are sent) """
+		await self._event.wait()
@@ -0,0 +1,156 @@
+"""
+  vfd_bus.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It drives several PT6302 chips sharing the CLKB and DIN lines (one CSB line per chip)
+          and broadcasts the identical commands to all the chips at once.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from vfd_pt63 import VFD_PT6302, char_columns, _SPACES
+import time
+
+class MultiCS:
+	""" Pin-like object driving several CSB pins together. Used as cs pin of a transport, the
+	    frames are received by all the chips at once (broadcast). """
+	def __init__( self, pins ):
+		self.pins = pins
+
+	def value( self, state=None ):
+		if state == None:
+			return self.pins[0].value()
+		for _pin in self.pins:
+			_pin.value( state )
+
+
+class PT6302Bus:
+	""" PT6302 chips sharing the sck and sdata pins (or the SPI bus), with one cs pin per chip.
+	    bus[i] is the VFD_PT6302 driver of a chip. The bus methods (initialization, duty, clear,
+	    custom chars, ...) are broadcasted: a single frame is received by all the chips. """
+	def __init__( self, sck, sdata, cs_pins, reset=None, digits=15, spi=None, spi_lsb=True ):
+		""" cs_pins: list of the CSB pins (one per chip). reset: optional reset pin shared by the
+		    chips. digits: digits of each chip, int (all the chips) or list (one value per chip).
+		    spi, spi_lsb: see VFD_PT6302. """
+		if type( digits ) is int:
+			digits = [digits]*len( cs_pins )
+		assert len( digits ) == len( cs_pins )
+		self.chips = [ VFD_PT6302( sck, sdata, cs_pins[i], None, digits[i], spi, spi_lsb, init=False ) for i in range(len(cs_pins)) ]
+		self.all = VFD_PT6302( sck, sdata, MultiCS( cs_pins ), reset, max(digits), spi, spi_lsb, init=False ) # broadcast
+		self._batch = 0
+		self.init()
+
+	def __len__( self ):
+		return len( self.chips )
+
+	def __getitem__( self, idx ):
+		return self.chips[idx]
+
+	def init( self ):
+		""" Reset the chips then broadcast the initialization commands. The digit length is sent
+		    to each chip when they do not have the same number of digits. """
+		_all = self.all
+		if _all.reset != None:
+			_all.reset.value( False ) # Do reset
+			time.sleep_ms( 20 )
+			_all.reset.value( True )
+			time.sleep_ms( 10 )
+		for _chip in self.chips:
+			_chip.invalidate()
+		with self.batch():
+			_all.output_port_set( True, False )
+			_all.normal_operation()
+			if self._same_digits():
+				_all.digit_length( _all.digits )
+			else:
+				for _chip in self.chips:
+					_chip.digit_length( _chip.digits )
+			_all.display_duty( 7 ) # same duty as VFD_PT6302.init()
+			self.clear()
+
+	def _same_digits( self ):
+		for _chip in self.chips:
+			if _chip.digits != self.all.digits:
+				return False
+		return True
+
+	def batch( self ):
+		""" Queue the commands of the bus and of all the chips, then send them when leaving the with
+		    block: broadcasted commands first, then the changes of each chip (one chip after the other).
+		    with bus.batch():
+		        bus[0].display_digit( 1, "Hello" )
+		        bus[1].display_digit( 1, "World" ) """
+		return self
+
+	def __enter__( self ):
+		self._batch += 1
+		self.all.__enter__()
+		for _chip in self.chips:
+			_chip.__enter__()
+		return self
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		self._batch -= 1
+		self.all.__exit__( exc_type, exc_value, traceback )
+		for _chip in self.chips:
+			_chip.__exit__( exc_type, exc_value, traceback )
+		return False
+
+	def flush( self ):
+		""" Send the commands queued by batch() """
+		self.all.flush()
+		for _chip in self.chips:
+			_chip.flush()
+
+	def normal_operation( self ):
+		self.all.normal_operation()
+
+	def all_digit_on( self ):
+		self.all.all_digit_on()
+
+	def all_digit_off( self ):
+		self.all.all_digit_off()
+
+	def display_duty( self, value ):
+		""" Brightness of all the chips (1..8, see VFD_PT6302.display_duty) """
+		self.all.display_duty( value )
+
+	def output_port_set( self, port1, port2 ):
+		self.all.output_port_set( port1, port2 )
+
+	def clear( self ):
+		""" Clear all the chips with a single broadcasted frame """
+		self.all._write_dcram( 0, _SPACES, 0, self.all.digits, True ) # chip shadows may differ
+		for _chip in self.chips:
+			_dcram = _chip._dcram
+			for i in range( _chip.digits ):
+				_dcram[i] = 0x20
+			_chip._dcram_valid |= (1 << _chip.digits) - 1
+
+	def define_char( self, ram_idx, char_def ):
+		""" Define a 5 x 7 character (7 rows, see VFD_PT6302.define_char) in all the chips """
+		self.write_char( ram_idx, char_columns( char_def ) )
+
+	def write_char( self, ram_idx, data, offset=0 ):
+		""" Write the 5 columns bytes of a RAM char (see VFD_PT6302.write_char) in all the chips """
+		self.all.write_char( ram_idx, data, offset, True ) # chip caches may differ
+		_base = ram_idx*5
+		for _chip in self.chips:
+			_cgram = _chip._cgram
+			for i in range( 5 ):
+				_cgram[_base+i] = data[offset+i]
+			_chip._cgram_valid |= 1 << ram_idx
@@ -0,0 +1,138 @@
+"""
+  vfd_canvas.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It treats a row of displays (several PT6302 chips) as a single long text canvas,
+          displayed through a scrollable viewport.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+class Canvas:
+	""" Text canvas of width chars shown on several displays placed side by side. The text is
+	    written in canvas columns (from 0), refresh() sends the viewport (columns offset to
+	    offset+viewport width-1) to the displays. Only the chips showing modified columns are
+	    refreshed and display_digit() only sends the chars that changed on each chip. """
+	def __init__( self, displays, width=None, wrap=False ):
+		""" displays: list of VFD_PT6302 (from left to right, all their digits are used) or of
+		    (vfd, first_position, count) tuples to use a part of a display (eg: (vfd, 4, 12)).
+		    A vfd_bus.PT6302Bus can also be used. width: canvas width (viewport width by default).
+		    wrap: the canvas loops when scrolling, otherwise the columns out of the canvas are blank. """
+		if hasattr( displays, 'chips' ): # PT6302Bus
+			displays = displays.chips
+		self._zones = [] # (vfd, first position, count, first viewport column)
+		_col = 0
+		for _item in displays:
+			if type( _item ) is tuple:
+				_vfd, _first, _count = _item
+			else:
+				_vfd, _first, _count = _item, 1, _item.digits
+			assert 1 <= _first and (_first+_count-1) <= 16
+			self._zones.append( (_vfd, _first, _count, _col) )
+			_col += _count
+		self.view_width = _col
+		self.width = _col if width == None else width
+		self.wrap = wrap
+		self.buffer = bytearray( b' '*self.width )
+		self.offset = 0 # canvas column shown on the first viewport column
+		self._scratch = bytearray( 16 ) # chars of a zone
+		_mv = memoryview( self._scratch )
+		self._views = [ _mv[:n] for n in range(17) ]
+		self._dirty_lo = 0 # modified canvas columns (since the last refresh)
+		self._dirty_hi = self.width
+		self._scrolled = True
+
+	def locate( self, column ):
+		""" The (vfd, position) showing a canvas column or None when not in the viewport """
+		_col = column - self.offset
+		if self.wrap:
+			_col %= self.width
+		for _vfd, _first, _count, _base in self._zones:
+			if _base <= _col < _base+_count:
+				return (_vfd, _first+_col-_base)
+		return None
+
+	def _touch( self, start, end ):
+		# Mark the canvas columns start..end-1 as modified
+		if self._dirty_lo >= self._dirty_hi:
+			self._dirty_lo, self._dirty_hi = start, end
+		else:
+			self._dirty_lo = min( self._dirty_lo, start )
+			self._dirty_hi = max( self._dirty_hi, end )
+
+	def write( self, column, text ):
+		""" Write a str (ASCII) or bytes/bytearray in the canvas from column (clipped to the width) """
+		_buf = self.buffer
+		_str = type(text) is str
+		_start = max( column, 0 )
+		_end = min( column+len(text), self.width )
+		for _col in range( _start, _end ):
+			_buf[_col] = ord( text[_col-column] ) if _str else text[_col-column]
+		if _start < _end:
+			self._touch( _start, _end )
+
+	def fill( self, code=0x20 ):
+		""" Fill the whole canvas with a char code (space by default) """
+		_buf = self.buffer
+		for i in range( self.width ):
+			_buf[i] = code
+		self._touch( 0, self.width )
+
+	def clear( self ):
+		self.fill( 0x20 )
+
+	def scroll_to( self, offset ):
+		""" Show the canvas from column offset (can be negative or beyond the width) """
+		if self.wrap:
+			offset %= self.width
+		if offset != self.offset:
+			self.offset = offset
+			self._scrolled = True
+
+	def scroll( self, delta=1 ):
+		""" Move the viewport by delta columns (to the right when positive) """
+		self.scroll_to( self.offset + delta )
+
+	def _visible( self, start, count ):
+		# True when the canvas columns start..start+count-1 contain modified columns
+		if self._dirty_lo >= self._dirty_hi:
+			return False
+		if not self.wrap:
+			return (start < self._dirty_hi) and (self._dirty_lo < start+count)
+		for i in range( count ): # wrapped window
+			if self._dirty_lo <= (start+i) % self.width < self._dirty_hi:
+				return True
+		return False
+
+	def refresh( self, force=False ):
+		""" Send the viewport to the displays (only the chips showing changes, see display_digit) """
+		_buf = self.buffer
+		_width = self.width
+		_scratch = self._scratch
+		for _vfd, _first, _count, _base in self._zones:
+			_start = self.offset + _base
+			if not( force or self._scrolled or self._visible(_start, _count) ):
+				continue
+			for i in range( _count ):
+				_col = _start + i
+				if self.wrap:
+					_col %= _width
+				_scratch[i] = _buf[_col] if 0 <= _col < _width else 0x20
+			_vfd.display_digit( _first, self._views[_count], force )
+		self._dirty_lo = self._dirty_hi = 0
+		self._scrolled = False
@@ -0,0 +1,133 @@
+"""
+  vfd_emul.py is a PT6302 protocol emulator (Vaccum Fluorescent Display) running under
+          CPython or MicroPython. Used as transport, it decodes the command bytes into the
+          DCRAM, CGRAM, ADRAM, duty, digit length, output ports and all-on/off state.
+
+          Allows to run the vfd_pt63 & vfd_proximus libraries off-target.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+# Normal operation, all digit OFF, all digit ON (see VFD_PT6302.cmd_all_digit)
+NORMAL = 'normal'
+ALL_OFF = 'off'
+ALL_ON = 'on'
+
+class PT6302Emulator:
+	""" Transport decoding the PT6302 frames into a display state. Each write() call is a CS frame """
+	def __init__( self, log=False ):
+		""" log: keep a copy of every received frame in the frames list """
+		self.frames = [] if log else None
+		self.reset()
+
+	def reset( self ):
+		""" Initial status of the chip after a reset (RSTB low) """
+		self.dcram = bytearray( 16 ) # character code for each digit
+		self.cgram = bytearray( 8*5 ) # 5 columns for each RAM0..RAM7 char
+		self.adram = bytearray( 16 ) # 2 symbols bits per digit
+		self.duty = 1
+		self.digits = 16
+		self.port1 = False
+		self.port2 = False
+		self.mode = ALL_OFF
+		self.frame_count = 0 # CS frames
+		self.byte_count = 0 # bytes on the wire
+		if self.frames != None:
+			self.frames.clear()
+
+	def write( self, arr ):
+		""" Decode a CS frame (command byte followed by data bytes) """
+		_len = len( arr )
+		if _len == 0:
+			return
+		self.frame_count += 1
+		self.byte_count += _len
+		if self.frames != None:
+			self.frames.append( bytes(arr) )
+		_cmd = arr[0]
+		_op = _cmd & 0xF0
+		if _op == 0x10: # DCRAM data write, auto-increment
+			_addr = _cmd & 0x0F
+			for i in range( 1, _len ):
+				self.dcram[_addr] = arr[i]
+				_addr = (_addr+1) & 0x0F
+		elif _op == 0x20: # CGRAM data write, 5 bytes per char, auto-increment
+			_addr = _cmd & 0x07
+			for i in range( 1, _len-4, 5 ):
+				for col in range( 5 ):
+					self.cgram[_addr*5+col] = arr[i+col] & 0x7F
+				_addr = (_addr+1) & 0x07
+		elif _op == 0x30: # ADRAM data write, auto-increment
+			_addr = _cmd & 0x0F
+			for i in range( 1, _len ):
+				self.adram[_addr] = arr[i] & 0x03
+				_addr = (_addr+1) & 0x0F
+		elif _op == 0x40: # Output port set
+			self.port1 = (_cmd & 0x01)==0x01
+			self.port2 = (_cmd & 0x02)==0x02
+		elif _op == 0x50: # Display duty
+			self.duty = (_cmd & 0x07)+1
+		elif _op == 0x60: # Number of digits
+			_k = _cmd & 0x07
+			self.digits = 16 if _k == 0 else 8+_k
+		elif _op == 0x70: # All digit ON/OFF
+			if _cmd & 0x02:
+				self.mode = ALL_ON
+			elif _cmd & 0x01:
+				self.mode = ALL_OFF
+			else:
+				self.mode = NORMAL
+		else:
+			raise ValueError( "unknown command 0x%02x" % _cmd )
+
+	def text( self, position=1, length=None ):
+		""" Characters stored in DCRAM from position (1..16). CGRAM chars are returned as chr(0..7) """
+		if length == None:
+			length = self.digits - position + 1
+		return ''.join( [ chr(self.dcram[(position-1+i) & 0x0F]) for i in range(length) ] )
+
+	def char( self, ram_idx ):
+		""" The 5 columns bytes of a CGRAM char """
+		return bytes( self.cgram[ram_idx*5:ram_idx*5+5] )
+
+	def rows( self, ram_idx ):
+		""" The CGRAM char as 7 lines of 5 bits (same format as VFD_PT6302.define_char) """
+		_rows = [0]*7
+		for col in range( 5 ):
+			_val = self.cgram[ram_idx*5+col]
+			for row in range( 7 ):
+				if _val & (1<<row):
+					_rows[row] |= 1 << (4-col)
+		return _rows
+
+	def segments( self, position ):
+		""" Set of lit segments (0..34) of the digit at position (1..16) showing a CGRAM char
+		    (see DigitSegments). Returns None when the digit displays a CGROM char """
+		_code = self.dcram[position-1]
+		if _code > 7:
+			return None
+		_segs = set()
+		for seg in range( 35 ):
+			_s = 34-seg
+			_col = 4-(_s % 5)
+			_bit = 6-(_s // 5)
+			if self.cgram[_code*5+_col] & (1<<_bit):
+				_segs.add( seg )
+		return _segs
@@ -0,0 +1,79 @@
+"""
+  vfd_font.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It stores 5x7 fonts already transposed in the PT6302 CGRAM column format, in a
+          single bytes blob (5 bytes per glyph) which can be frozen in flash.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from vfd_pt63 import char_columns
+
+class Font:
+	""" Precompiled font: chars is the string of the glyph chars, blob holds the 5 CGRAM
+	    columns of each glyph (in the chars order). Uploading a glyph does not transpose
+	    nor allocate, the columns are sent straight from the blob. """
+	def __init__( self, chars, blob ):
+		assert len(blob) == 5*len(chars), "blob must contain 5 bytes per char"
+		self.chars = chars
+		self.blob = blob
+		self._view = memoryview( blob )
+
+	def __len__( self ):
+		return len( self.chars )
+
+	def __contains__( self, ch ):
+		return self.chars.find( ch ) >= 0
+
+	def offset( self, ch ):
+		""" Offset of the glyph columns in the blob (-1 when the char is not in the font) """
+		_idx = self.chars.find( ch )
+		return -1 if _idx < 0 else _idx*5
+
+	def glyph( self, ch ):
+		""" The 5 column bytes of a char (memoryview over the blob) or None """
+		_ofs = self.offset( ch )
+		return None if _ofs < 0 else self._view[_ofs:_ofs+5]
+
+	def upload( self, vfd, ram_idx, ch ):
+		""" Store the glyph of ch in the RAM char ram_idx (RAM0..RAM7). Returns False when
+		    the char is not in the font. """
+		_ofs = self.offset( ch )
+		if _ofs < 0:
+			return False
+		vfd.write_char( ram_idx, self.blob, _ofs )
+		return True
+
+
+def compile_font( glyphs ):
+	""" Convert a dictionnary char -> 7 rows glyph (see VFD_PT6302.define_char) into a
+	    (chars, blob) tuple for Font. Fine on the host, avoid it on the microcontroller. """
+	_chars = ''.join( sorted(glyphs) )
+	_blob = bytearray( 5*len(_chars) )
+	for i in range( len(_chars) ):
+		char_columns( glyphs[_chars[i]], _blob, i*5 )
+	return _chars, bytes( _blob )
+
+def font_source( glyphs, name='FONT' ):
+	""" Python source declaring the compiled glyphs as a Font named name (to freeze it) """
+	_chars, _blob = compile_font( glyphs )
+	_lines = [ "%s = Font( %r," % (name, _chars) ]
+	for i in range( 0, len(_blob), 40 ): # 8 glyphs per line
+		_lines.append( "\t%r" % _blob[i:i+40] )
+	_lines[-1] += " )"
+	return '\n'.join( _lines ) + '\n'
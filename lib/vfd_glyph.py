@@ -0,0 +1,97 @@
+"""
+  vfd_glyph.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It displays extended (accented) characters and icons by mapping them onto the 8
+          custom chars (CGRAM) with a Least Recently Used allocator.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from vfd_pt63 import RAM0, RAM1, RAM2, RAM3, RAM4
+from vfd_font import Font, compile_font
+
+# 5x7 glyphs of the non ASCII chars in the CGRAM column format (see vfd_font.py),
+# compiled from tools/font_latin.py with tools/vfd_fontc.py
+FONT = Font( '°ÀÇÈÉàâäçèéêëîïôöùûü€←→♥',
+	b'\x06\t\t\x06\x00|\x13\x12\x12|\x1e!a!\x12~KJJB~JJKB UVTx VUVx UTUx'
+	b'\x0cR2\x12\x008UVT\x188TVU\x188VUV\x188UTU\x18\x00F}B\x00\x00E|A\x008FEF8'
+	b'8EDE8<AB |<BA"|<A@!|\x14>UUA\x08\x1c*\x08\x08\x08\x08*\x1c\x08\x0c\x1e<\x1e\x0c' )
+
+class GlyphCache:
+	""" Display text with non ASCII chars. The glyphs are uploaded in the CGRAM slots on demand,
+	    the least recently used glyph is replaced when all the slots are taken. The slots are
+	    owned by the GlyphCache (do not use them for other custom chars). """
+	def __init__( self, vfd, font=FONT, slots=(RAM0, RAM1, RAM2, RAM3, RAM4), missing='?' ):
+		""" vfd: the VFD_PT6302 driver. font: vfd_font.Font (or dictionnary char -> 7 rows glyph).
+		    slots: the CGRAM slots used by the cache. missing: char displayed when no glyph available """
+		self.vfd = vfd
+		if type( font ) is dict:
+			font = Font( *compile_font(font) )
+		self.font = font
+		self.slots = bytes( slots )
+		self.missing = ord( missing )
+		self._chars = [None]*len( slots ) # glyph resident in each slot
+		self._stamps = [0]*len( slots ) # last use of each slot (LRU)
+		self._resident = {} # char -> slot index
+		self._clock = 0
+		self._buf = bytearray( 16 )
+		self.uploads = 0 # glyphs uploaded to the CGRAM
+
+	def _slot( self, ch, now ):
+		# Index of the slot holding the glyph of ch (uploaded if needed) or None
+		_idx = self._resident.get( ch )
+		_now_rank = now # displayed glyphs are ranked after all the others
+		if _idx == None:
+			if ch not in self.font:
+				return None
+			# Least recently used slot not used by the current text, preferably not displayed anymore
+			_best = None
+			for i in range( len(self._stamps) ):
+				if self._stamps[i] >= now:
+					continue
+				_rank = self._stamps[i] + (_now_rank if self.vfd.is_displayed( self.slots[i] ) else 0)
+				if (_best == None) or (_rank < _best):
+					_idx = i
+					_best = _rank
+			if _idx == None: # More glyphs than slots in the text
+				return None
+			if self._chars[_idx] != None:
+				del self._resident[ self._chars[_idx] ]
+			self._chars[_idx] = ch
+			self._resident[ch] = _idx
+			self.font.upload( self.vfd, self.slots[_idx], ch )
+			self.uploads += 1
+		self._stamps[_idx] = now
+		return _idx
+
+	def print( self, position, text ):
+		""" Display the text from position (1..16), non ASCII chars are mapped onto the CGRAM slots """
+		self._clock += 1
+		_now = self._clock
+		_buf = self._buf
+		_n = 0
+		for ch in text:
+			if _n >= 16:
+				break
+			_code = ord( ch )
+			if _code >= 0x80:
+				_idx = self._slot( ch, _now )
+				_code = self.missing if _idx == None else self.slots[_idx]
+			_buf[_n] = _code
+			_n += 1
+		self.vfd.display_digit( position, memoryview(_buf)[:_n] )
@@ -0,0 +1,103 @@
+"""
+  vfd_pio.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It contains a rp2 (RP2040) transport sending the PT6302 frames with a PIO state
+          machine (and optionnaly with DMA).
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import rp2
+from machine import Pin
+from micropython import const
+
+_PIO0_TXF = const(0x50200010) # TX FIFO register of PIO0 SM0 (+4 for each SM)
+_PIO1_TXF = const(0x50300010) # TX FIFO register of PIO1 SM0
+
+@rp2.asm_pio( sideset_init=rp2.PIO.OUT_HIGH, out_init=rp2.PIO.OUT_LOW, set_init=rp2.PIO.OUT_HIGH, out_shiftdir=rp2.PIO.SHIFT_RIGHT )
+def pt6302_frame():
+	# One frame = 1 word with (byte count - 1) followed by 1 word per byte (LSB used).
+	# side-set pin = CLKB, out pin = DIN, set pin = CSB. At 2 MHz, 1 cycle = 0.5us
+	pull( block )          .side(1)
+	mov( x, osr )          .side(1)
+	set( pins, 0 )         .side(1) [1] # CSB low (tCSS)
+	label( "byte" )
+	pull( block )          .side(1)
+	set( y, 7 )            .side(1)
+	label( "bit" )
+	out( pins, 1 )         .side(0) [1] # DIN while CLKB is low, LSB first
+	jmp( y_dec, "bit" )    .side(1) [1] # rising edge for data acquisition
+	nop()                  .side(1) [15] # data processing time (tDOFF 8us)
+	jmp( x_dec, "byte" )   .side(1) [15]
+	nop()                  .side(1) [15] # CSB hold time (tCSH 16us)
+	set( pins, 1 )         .side(1)
+
+
+class PIOTransport:
+	""" Send PT6302 frames with a PIO state machine. CSB is handled by the PIO program.
+	    With dma=True, write() returns immediately and the frame is streamed by DMA. """
+	def __init__( self, sm_id, sck, sdata, cs, freq=2_000_000, dma=True, size=64 ):
+		""" sm_id: state machine 0..7. sck, sdata, cs: Pin objects or pin numbers.
+		    freq: state machine frequency (2 MHz = 500 KHz CLKB, PT6302 is limited to 1 MHz).
+		    size: initial size of the DMA buffer (grows when needed). """
+		assert 0 <= sm_id <= 7
+		_sck = sck if isinstance(sck, Pin) else Pin( sck, Pin.OUT, value=True )
+		_sdata = sdata if isinstance(sdata, Pin) else Pin( sdata, Pin.OUT )
+		_cs = cs if isinstance(cs, Pin) else Pin( cs, Pin.OUT, value=True )
+		self.sm = rp2.StateMachine( sm_id, pt6302_frame, freq=freq, sideset_base=_sck, out_base=_sdata, set_base=_cs )
+		self.sm.active( 1 )
+		self.dma = None
+		if dma:
+			self.dma = rp2.DMA()
+			self._buf = bytearray( size )
+			self._txf = (_PIO1_TXF if sm_id > 3 else _PIO0_TXF) + 4*(sm_id % 4)
+			_treq = (8 if sm_id > 3 else 0) + (sm_id % 4) # DREQ_PIOx_TXy
+			self._ctrl = self.dma.pack_ctrl( size=0, inc_write=False, treq_sel=_treq )
+
+	def busy( self ):
+		""" True while the DMA is still streaming the previous frame """
+		return (self.dma != None) and self.dma.active()
+
+	def wait( self ):
+		""" Wait for the DMA to complete the previous frame """
+		while self.busy():
+			pass
+
+	def write( self, arr ):
+		""" Send the bytes/bytearray content as a single CS frame """
+		_len = len( arr )
+		if _len == 0:
+			return
+		self.wait() # The next count word must not interleave with DMA data
+		if self.dma == None:
+			self.sm.put( _len-1 )
+			self.sm.put( arr )
+			return
+		if _len > len( self._buf ):
+			self._buf = bytearray( _len )
+		_buf = self._buf
+		_buf[0:_len] = arr # caller may reuse its buffer before DMA completes
+		self.sm.put( _len-1 )
+		self.dma.config( read=_buf, write=self._txf, count=_len, ctrl=self._ctrl, trigger=True )
+
+	def deinit( self ):
+		""" Release the state machine and the DMA channel """
+		self.wait()
+		self.sm.active( 0 )
+		if self.dma != None:
+			self.dma.close()
@@ -25,9 +25,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
-from machine import Pin
+try:
+	from machine import Pin
+except ImportError: # CPython (host side tests with vfd_emul)
+	Pin = None
 from vfd_pt63 import *
-from micropython import const
+from vfd_pt63 import _SEG_BYTE, _SEG_MASK, _SPACES
+try:
+	from micropython import const
+except ImportError:
+	const = lambda x : x
 import time
 
 TITLE = const(1)
@@ -42,6 +49,16 @@ FM = const(9)
 
 ALL_OPTIONS = set( [TITLE,CHANNEL,TRACK,STEREO,RECORD,CLOCK,ANTENNA,AM,FM] )
 
+# Symbol segments: (option, digit segments 0..2 for RAM5..RAM7, segment)
+_SYMBOL_SEGS = ( (TITLE,0,32), (CHANNEL,0,24), (TRACK,0,7), (AM,1,32), (FM,1,34),
+                 (STEREO,2,27), (RECORD,2,28), (CLOCK,2,32), (ANTENNA,2,33) )
+# Symbols as (option, offset, mask) over the 3 x 5 payload bytes, and the mask of all the symbols
+_SYMBOLS = tuple( [ (_o, _d*5+_SEG_BYTE[_s]-1, _SEG_MASK[_s]) for _o, _d, _s in _SYMBOL_SEGS ] )
+_SYM_CLEAR = bytearray( 15 )
+for _o, _ofs, _mask in _SYMBOLS:
+	_SYM_CLEAR[_ofs] |= _mask
+_SYM_CLEAR = bytes( _SYM_CLEAR )
+
 # Separator value
 COLON = const(2)
 DOT = const(1)
@@ -53,7 +70,7 @@ class OptionSet( set ):
 
 	def __iadd__( self, other ):
 		assert type(other) is int
-		self.update( [other] )
+		self.add( other )
 		self.owner.update()
 		return self
 
@@ -64,9 +81,12 @@ class OptionSet( set ):
 		return self
 
 
+BLANK = const(10) # Index of the blank digit in the precomputed masks
+
 class BasePanel():
 	# for 0,1,..9, status for ...,seg2,seg1,seg0 
 	DIGITS = [ 0b01110111, 0b00010010, 0b01011101, 0b01011011, 0b00111010, 0b01101011, 0b01101111, 0b01010010, 0b01111111, 0b01111011 ] 
+	_masks = None # (clear, set, pairs) payload masks of each digit, computed once per panel class
 	
 	def __init__( self, owner, segments ):
 		self.owner = owner
@@ -74,20 +94,53 @@ class BasePanel():
 		self._root = None # Must be defined in descendant
 		self._point = None 
 
+	def _build_masks( self ):
+		# Precompute, for each digit position, the 5 payload bytes to clear (all the segments of the
+		# digit) and the 5 payload bytes to set for the values 0..9 and BLANK. Then merge them for
+		# each pair of digits (units+tens) for the values 00..99. Called by descendant once the
+		# _root is defined.
+		_cls = type( self )
+		if _cls._masks != None:
+			return
+		_count = len( self._root )
+		_clear = bytearray( 5*_count )
+		_set = bytearray( 5*11*_count )
+		for digit_num in range( _count ):
+			for value in range( 11 ):
+				if digit_num==4: # Digit 4 is for hundred --> only on segment to light!
+					segs = [ (self._root[digit_num], (value != BLANK) and (value > 0)) ]
+				else:
+					bits = self.DIGITS[value] if value != BLANK else 0b00000000
+					segs = [ (self._root[digit_num]+idx, (bits & (1<<idx)) != 0) for idx in range(7) ]
+				for seg, lit in segs:
+					_clear[ digit_num*5 + _SEG_BYTE[seg]-1 ] |= _SEG_MASK[seg]
+					if lit:
+						_set[ (digit_num*11+value)*5 + _SEG_BYTE[seg]-1 ] |= _SEG_MASK[seg]
+		_pairs = []
+		for group in range( _count // 2 ): # units at digit 2*group, tens at digit 2*group+1
+			_pclear = bytearray( 5 )
+			_pset = bytearray( 5*100 )
+			for i in range( 5 ):
+				_pclear[i] = _clear[group*10+i] | _clear[group*10+5+i]
+			for value in range( 100 ):
+				for i in range( 5 ):
+					_pset[value*5+i] = _set[ (group*22+value%10)*5+i ] | _set[ ((group*2+1)*11+value//10)*5+i ]
+			_pairs.append( (bytes(_pclear), bytes(_pset)) )
+		_cls._masks = ( bytes(_clear), bytes(_set), _pairs )
+
 	def set_digit( self, digit_num, value ):
 		""" Initialize the segments of a given digit 0..4 (0 is the right most) """
 		assert (value==None) or (0<=value<=9)
-		assert 0<=digit_num<=4
+		assert 0<=digit_num<len( self._root )
+		_clear, _set, _pairs = self._masks
+		if value == None:
+			value = BLANK
+		self._seg.apply( _clear, digit_num*5, _set, (digit_num*11+value)*5 )
 
-		# Digit 4 is for hundred --> only on segment to light!
-		if digit_num==4:
-			self._seg.set( self._root[digit_num], (value != None) and (value > 0) )
-		else:
-			bits = self.DIGITS[value] if value!=None else 0b00000000
-			for segment_idx in range( 7 ):
-				mask = (1 << segment_idx)
-				#print( "segment", self._root[digit_num]+segment_idx, "value", (bits & mask) == mask )
-				self._seg.set( self._root[digit_num]+segment_idx, (bits & mask) == mask)
+	def set_pair( self, group, value ):
+		""" Display value%100 on a pair of digits (group 0 = digits 0 & 1, group 1 = digits 2 & 3) """
+		_pclear, _pset = self._masks[2][group]
+		self._seg.apply( _pclear, 0, _pset, (value%100)*5 )
 
 	@property
 	def separator( self ):
@@ -96,22 +149,16 @@ class BasePanel():
 
 	@separator.setter
 	def separator( self, value ):
-		self._seg.set( self._point, value in (COLON,) )
-		self._seg.set( self._point+1, value in (COLON,DOT) )
+		self._seg.set( self._point, value == COLON )
+		self._seg.set( self._point+1, (value == COLON) or (value == DOT) )
 		self._sep = value
 
 
 	def decompose( self, value ):
 		# Decompose a value in digits
-		_s = str(value)
-		digits = [ int(_s[i]) for i in range( len(_s)-1,-1,-1 )]
-		units = digits[0]
-		tens  = 0
-		if len(digits)>1:
-			tens = digits[1]
-		hundreds = 0
-		if len(digits)>2:
-			hundreds = digits[2]
+		units = value % 10
+		tens = (value // 10) % 10
+		hundreds = (value // 100) % 10
 		return( units, tens, hundreds )
 
 
@@ -126,6 +173,7 @@ class DigitalPanel( BasePanel ):
 		super().__init__( owner, segments )
 		self._root = [0,8,17,25,33] # Root of each number (1rst segment of each digit, from left to right)
 		self._point = 15 # (on top) and 16 (on the bottom)
+		self._build_masks()
 
 	def set( self, digit_group2=None, digit_group1=None ):
 		""" Allows to set the digits segments. Group 1 is on the right, group 2 on the left """
@@ -134,16 +182,11 @@ class DigitalPanel( BasePanel ):
 
 		# Light up segments for the corresponding digit
 		if digit_group1 != None:
-			u,t,h = self.decompose( digit_group1 )
-			self.set_digit( 0, u )
-			self.set_digit( 1, t )
-			# None
+			self.set_pair( 0, digit_group1 )
 		if digit_group2 != None:
-			u,t,h = self.decompose( digit_group2 )
-			self.set_digit( 2, u )
-			self.set_digit( 3, t )
+			self.set_pair( 1, digit_group2 )
 			# Light for Hundreds
-			self.set_digit( 4, h )
+			self.set_digit( 4, (digit_group2 // 100) % 10 )
 
 	def clear( self, digit_group_index=None ):
 		# Clear the digit group 1 or 2
@@ -158,33 +201,61 @@ class DigitalPanel( BasePanel ):
 	def int( self, value ):
 		""" Display an integer value from 0 to 19999 """
 		assert 0<=value<=19999
-		# Clear the digits
-		self.clear( 1 ) 
-		self.clear( 2 )
 		# Clear separator
 		self.separator = None
-		# Display the value
-		self.set( digit_group2=value // 100 if value > 99 else None, digit_group1=value%100)
+		# Display the value (group 1 always rewritten)
+		if value > 99:
+			self.set( digit_group2=value // 100, digit_group1=value % 100 )
+		else:
+			self.clear( 2 )
+			self.set( digit_group1=value )
 
 	def float( self, value ):
 		""" Display an integer value from 0 to 199.99 """
 		assert 0<=value<=199.99
-		self.clear( 1 )
-		self.clear( 2 )
+		self.fixed( int( value*100 + 0.5 ) ) # Rounded to the nearest hundredth
+
+	def fixed( self, value ):
+		""" Display a fixed point value expressed in hundredths (0 to 19999 for 0.00 to 199.99) """
+		assert 0<=value<=19999
 		# Set separator
 		self.separator = DOT
 		# Display the value
-		self.set( digit_group2=int(value), digit_group1 = int((value-int(value))*100) )
+		self.set( digit_group2=value // 100, digit_group1=value % 100 )
 
 
 class DiskPanel( BasePanel ):
+	_disc_masks = None # (clear, frames) payload masks of the disc rotation, computed once
+
 	def __init__( self, owner, segments ):
 		super().__init__( owner, segments )
 		self._root = [8,0] # Root of each number (1rst segment of each digit, from left to right)
 		self._point = 15 # (on top) and 16 (on the bottom)
+		self._build_masks()
 		self._discsegs = [17,18,19,20,21,22,23,24,25,26]
+		self._build_disc_masks()
+		self._spinner = TimerTask( owner, self._spin_tick ) # disc_spin() timer
 		self._rotate_clear()
 
+	def _build_disc_masks( self ):
+		# Precompute the 5 payload bytes of the 10 disc positions for the positive rotation (all the
+		# disc lit except the current position) and negative rotation (only the current position lit)
+		_cls = type( self )
+		if _cls._disc_masks != None:
+			return
+		_count = len( self._discsegs )
+		_clear = bytearray( 5 )
+		_frames = bytearray( 2*_count*5 )
+		for seg in self._discsegs:
+			_clear[ _SEG_BYTE[seg]-1 ] |= _SEG_MASK[seg]
+		for pos in range( _count ):
+			for idx, seg in enumerate( self._discsegs ):
+				if idx != pos: # positive rotation
+					_frames[ pos*5 + _SEG_BYTE[seg]-1 ] |= _SEG_MASK[seg]
+				else: # negative rotation
+					_frames[ (_count+pos)*5 + _SEG_BYTE[seg]-1 ] |= _SEG_MASK[seg]
+		_cls._disc_masks = ( bytes(_clear), bytes(_frames) )
+
 	def _rotate_clear( self ):
 		self._is_rotating = False
 		self._rotate_positive = True
@@ -195,9 +266,7 @@ class DiskPanel( BasePanel ):
 		assert 00 <= digit_group <= 99
 
 		# Light up segments for the corresponding digit
-		u,t,h = self.decompose( digit_group )
-		self.set_digit( 0, u )
-		self.set_digit( 1, t )
+		self.set_pair( 0, digit_group )
 
 	def clear( self ):
 		""" Clear the displayed digits """
@@ -209,6 +278,7 @@ class DiskPanel( BasePanel ):
 		for seg_id in self._discsegs:
 			self._seg.set( seg_id, state )
 		if not( state ):
+			self.disc_stop()
 			self._rotate_clear()
 
 	def disc_start( self, positive=True ):
@@ -220,37 +290,119 @@ class DiskPanel( BasePanel ):
 		self.disc_step()
 
 	def disc_step( self ):
+		""" Move the disc rotation to the next position (call update() to send it) """
 		assert self._is_rotating
-		# Invert current segment
-		if self._rotate_positive:
-			# Light-up current segment
-			# Turn-off next segment
-			self._seg.set( self._discsegs[self._rotate_pos], True )
-			self._rotate_pos += 1
-			if self._rotate_pos >= len( self._discsegs ):
-				self._rotate_pos = 0
-			self._seg.set( self._discsegs[self._rotate_pos], False )
+		self._rotate_pos += 1
+		if self._rotate_pos >= 10:
+			self._rotate_pos = 0
+		# Replace the disc segments with the precomputed frame (digits and symbols are kept)
+		_clear, _frames = self._disc_masks
+		self._seg.apply( _clear, 0, _frames, (self._rotate_pos if self._rotate_positive else 10+self._rotate_pos)*5 )
+
+	def disc_tick( self ):
+		""" Move the disc rotation to the next position and send it (single CGRAM transfer) """
+		self.disc_step()
+		self._seg.update()
+
+	def _spin_tick( self ):
+		if self._is_rotating:
+			self.disc_tick()
+
+	def disc_spin( self, rpm=60, positive=True, timer_id=-1 ):
+		""" Start the disc rotation driven by a machine.Timer at rpm rotations per minute """
+		assert 1 <= rpm <= 6000
+		self.disc_start( positive )
+		self._seg.update()
+		self._spinner.start( period=6000 // rpm, timer_id=timer_id ) # 10 steps per rotation
+
+	def disc_stop( self ):
+		""" Stop the Timer started with disc_spin() (the disc stays at its current position) """
+		self._spinner.stop()
+
+
+class Marquee():
+	""" Scroll a text of any length in the 12 chars text zone of the VFD_Proximus """
+	def __init__( self, owner, text, speed=4, gap=3 ):
+		""" speed: chars per second, gap: spaces between the end and the restart of the text """
+		assert speed > 0
+		self.owner = owner # The VFD_Proximus instance
+		self.speed = speed
+		self.gap = gap
+		self._window = bytearray( 12 ) # Displayed chars (sent with one auto-increment transfer)
+		self._task = TimerTask( owner, self.step ) # start() timer
+		self.text( text )
+
+	def text( self, text ):
+		""" Change the scrolling text (str or bytes) and restart from the first char """
+		if type(text) is str: # char codes like display_digit() (encode() would give UTF-8 bytes)
+			text = bytes( [ ord(ch) if ord(ch) < 0x100 else 0x3F for ch in text ] )
+		self._text = text
+		self._total = len( self._text ) + self.gap # viewport positions
+		self._offset = 0
+
+	def step( self ):
+		""" Advance the viewport of one char and rewrite the text zone """
+		_text = self._text
+		_len = len( _text )
+		_window = self._window
+		if _len <= 12: # Fit the display, nothing to scroll
+			for col in range( 12 ):
+				_window[col] = _text[col] if col < _len else 0x20
 		else:
-			# turn of the current segment
-			# Turn-on the next segment
-			self._seg.set( self._discsegs[self._rotate_pos], False )
-			self._rotate_pos += 1
-			if self._rotate_pos >= len( self._discsegs ):
-				self._rotate_pos = 0
-			self._seg.set( self._discsegs[self._rotate_pos], True )
+			i = self._offset
+			for col in range( 12 ):
+				_window[col] = _text[i] if i < _len else 0x20
+				i += 1
+				if i >= self._total:
+					i = 0
+			self._offset += 1
+			if self._offset >= self._total:
+				self._offset = 0
+		# Display starts at Digit 4. A scrolled text is rewritten in a single transfer, a fixed
+		# one only when changed.
+		self.owner.display_digit( 4, _window, force=(_len > 12) )
+
+	def start( self, timer_id=-1 ):
+		""" Scroll the text from a machine.Timer (at speed chars per second) """
+		self._task.start( freq=self.speed, timer_id=timer_id )
+
+	def stop( self ):
+		""" Stop the Timer started with start() """
+		self._task.stop()
+
+	def close( self ):
+		""" Stop the marquee and release its TimerTask (call it when the marquee is discarded) """
+		self._task.close()
+
+	async def run( self, count=None ):
+		""" Scroll the text from an asyncio task (count steps or forever) """
+		try:
+			import asyncio
+		except ImportError:
+			import uasyncio as asyncio
+		_period = 1 / self.speed
+		while (count == None) or (count > 0):
+			self.step()
+			if count != None:
+				count -= 1
+			await asyncio.sleep( _period )
 
 
 class VFD_Proximus( VFD_PT6302 ):
 	""" Specialized VFD_PT6302 for Proximus display """
-	def __init__( self, sck_pin, sdata_pin, cs_pin, reset_pin=None, digits=15 ):
+	def __init__( self, sck_pin, sdata_pin, cs_pin, reset_pin=None, digits=15, transport=None ):
+		""" transport: optional transport object (see VFD_PT6302) replacing the sck, sdata, cs pins """
 		if reset_pin != None:
 			_reset = Pin( reset_pin, Pin.OUT, value=True ) # Unactive
 		else:
 			_reset = None
-		_cs    = Pin( cs_pin, Pin.OUT, value=True ) # unactiva
-		_sdata = Pin( sdata_pin, Pin.OUT )
-		_sck   = Pin( sck_pin, Pin.OUT, value=True )
-		super().__init__( _sck, _sdata, _cs, _reset, digits )
+		if transport == None:
+			_cs    = Pin( cs_pin, Pin.OUT, value=True ) # unactiva
+			_sdata = Pin( sdata_pin, Pin.OUT )
+			_sck   = Pin( sck_pin, Pin.OUT, value=True )
+		else:
+			_cs, _sdata, _sck = None, None, None
+		super().__init__( _sck, _sdata, _cs, _reset, digits, transport=transport )
 		self._options = set([])
 		self._seg1 = self.attach_digit( 1, RAM5 ) # Seg of digit 1
 		self._seg2 = self.attach_digit( 2, RAM6 ) # Seg of digit 2
@@ -258,17 +410,23 @@ class VFD_Proximus( VFD_PT6302 ):
 		self._left_panel = DigitalPanel( self, self._seg1 )
 		self._center_panel = DigitalPanel( self, self._seg2 )
 		self._right_panel  = DiskPanel( self, self._seg3 )
+		self._sym_options = -1 # options of the _sym_set masks (bitmask)
+		self._sym_set = bytearray( 15 ) # symbol masks of the 3 digit segments
 		self.options = OptionSet( self, [] )
 
 
 	def clrscr( self ):
 		""" Clear the Text zone """
-		self.display_digit( 3, " "*13 )
+		self._write_dcram( 3, _SPACES, 0, 12, False ) # Displat starts at Digit 4
 
 	def print( self, text, from_pos=1 ):
 		""" Draw a text on the screen from position 1 to 12 """
 		max_len = 12 - (from_pos-1)
-		self.display_digit( from_pos+3, text[:max_len] ) # Displat starts at Digit 4
+		self._write_dcram( from_pos+2, text, 0, min( len(text), max_len ), False ) # Displat starts at Digit 4
+
+	def marquee( self, text, speed=4, gap=3 ):
+		""" Create a Marquee scrolling a long text in the text zone (see Marquee.start(), run(), step()) """
+		return Marquee( self, text, speed, gap )
 
 	@property
 	def center( self ):
@@ -286,19 +444,24 @@ class VFD_Proximus( VFD_PT6302 ):
 		return self._right_panel
 
 	def update( self ):
-		""" Update the Symbols on  VFD """
-		self._seg1.set( 32,   TITLE in self.options )
-		self._seg1.set( 24, CHANNEL in self.options )
-		self._seg1.set( 7,    TRACK in self.options )
-
-		self._seg2.set( 32,      AM in self.options )
-		self._seg2.set( 34,      FM in self.options )
-
-		self._seg3.set( 27,  STEREO in self.options )
-		self._seg3.set( 28,  RECORD in self.options )
-		self._seg3.set( 32,   CLOCK in self.options )
-		self._seg3.set( 33, ANTENNA in self.options )
-
-		self._seg1.update()
-		self._seg2.update()
-		self._seg3.update()
+		""" Update the Symbols on  VFD. RAM5..RAM7 are sent in a single CGRAM transfer and the
+		    digits 1..3 in a single DCRAM transfer, nothing is sent when unchanged. """
+		_options = 0
+		for _opt in self.options:
+			_options |= 1 << _opt
+		_set = self._sym_set
+		if _options != self._sym_options: # Rebuild the symbol masks
+			self._sym_options = _options
+			for i in range( 15 ):
+				_set[i] = 0
+			for _opt, _ofs, _mask in _SYMBOLS:
+				if _options & (1 << _opt):
+					_set[_ofs] |= _mask
+		# Always applied: the segments may have been cleared or set since the last update
+		self._seg1.apply( _SYM_CLEAR, 0, _set, 0 )
+		self._seg2.apply( _SYM_CLEAR, 5, _set, 5 )
+		self._seg3.apply( _SYM_CLEAR, 10, _set, 10 )
+		with self.batch(): # CGRAM and DCRAM writes are merged (only when changed)
+			self._seg1.update()
+			self._seg2.update()
+			self._seg3.update()
@@ -22,7 +22,20 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 import time
-from micropython import const
+from array import array
+try:
+	import micropython
+	from micropython import const
+except ImportError: # CPython (host side tests with vfd_emul)
+	micropython = None
+	const = lambda x : x
+
+if hasattr( time, 'ticks_us' ):
+	_ticks_us = time.ticks_us
+	_ticks_diff = time.ticks_diff
+else: # CPython
+	_ticks_us = lambda : time.perf_counter_ns() // 1000
+	_ticks_diff = lambda end, start : end - start
 
 RAM0 = const(0) # Char identification in CGRAM Character Graphic Ram
 RAM1 = const(1) 
@@ -33,54 +46,370 @@ RAM5 = const(5)
 RAM6 = const(6)
 RAM7 = const(7)
 
+_DCRAM_GAP = const(2) # Unchanged chars resent to merge two DCRAM runs (cheaper than a new CS frame)
+_SPACES = b'                ' # 16 spaces used by clear()
+
+# Instrumentation counters (see VFD_PT6302.instrument), frames & bytes for each command class
+_ST_US = const(0) # micro-seconds spent in send()
+_ST_DCRAM = const(1)
+_ST_CGRAM = const(3)
+_ST_CONTROL = const(5)
+_ST_SIZE = const(7)
+
+# IRQ queue records (4 bytes: opcode, a, b, c)
+_Q_SEGMENT = const(1) # a: attached segments index, b: segment, c: value
+_Q_CLEAR = const(2) # a: attached segments index
+_Q_DIGIT = const(3) # a: position, b: char code
+
+# Payload byte index (1..5) and bit mask of each segment 0..34 (byte 0 is the CGRAM command)
+_SEG_BYTE = bytes( [ 5-((34-seg) % 5) for seg in range(35) ] )
+_SEG_MASK = bytes( [ 1 << (6-((34-seg) // 5)) for seg in range(35) ] )
+
 class DigitSegments:
-	def __init__( self, owner, digit_idx, ram_idx ):
-		""" owner is the VFD_M6604 class """
+	__slots__ = ( 'owner', 'digit_idx', 'ram_idx', 'data', 'check', 'index' )
+
+	def __init__( self, owner, digit_idx, ram_idx, check=True ):
+		""" owner is the VFD_PT6302 class. check=False disables the segment validation in set() (for hot loops) """
 		assert RAM0 <= ram_idx <= RAM7
 		self.owner = owner
 		self.digit_idx = digit_idx
 		self.ram_idx = ram_idx
+		self.check = check
+		self.index = -1 # position in the owner attached segments (see attach_digit)
+		self.data = bytearray( 6 ) # CGRAM command + 5 columns
 		self.clear()
 
 	def clear( self ):
-		self.data = [ 0b00100000 | self.ram_idx , 0b0, 0b0, 0b0, 0b0, 0b0 ]
+		self.owner._busy += 1 # data shared with the TimerTask calls
+		try:
+			_d = self.data
+			_d[0] = 0b00100000 | self.ram_idx
+			for i in range( 1, 6 ):
+				_d[i] = 0
+		finally:
+			self.owner._leave()
 
 	def set( self, seg, value ):
-		assert 0 <= seg <= 34, "seg must be from 0 to 34"
-		seg = 34-seg
-		bit_shift = 6-((seg) // 5) # 7..0
-		byte_index = 6-(1+(seg % 5))   # 1..6 (0 is reserved)
-
-		_d = self.data[ byte_index ]
-		if value: # Set the bit
-			_d |= 1<<bit_shift
-		else: # clear the bit
-			_d &= (0xFF ^ (1<<bit_shift))
-		# Store the updated data
-		self.data[ byte_index ] = _d
-		#print(self.data)
+		if self.check:
+			assert 0 <= seg <= 34, "seg must be from 0 to 34"
+		self.owner._busy += 1
+		try:
+			if value: # Set the bit
+				self.data[ _SEG_BYTE[seg] ] |= _SEG_MASK[seg]
+			else: # clear the bit
+				self.data[ _SEG_BYTE[seg] ] &= 0xFF ^ _SEG_MASK[seg]
+		finally:
+			self.owner._leave()
+
+	def apply( self, clear_mask, clear_ofs, set_mask, set_ofs ):
+		""" Clear then set the payload bits with the 5 bytes masks stored at the given offsets """
+		self.owner._busy += 1
+		try:
+			_d = self.data
+			for i in range( 5 ):
+				_d[i+1] = (_d[i+1] & (0xFF ^ clear_mask[clear_ofs+i])) | set_mask[set_ofs+i]
+		finally:
+			self.owner._leave()
+
+	def get( self, seg ):
+		""" State of a segment """
+		return (self.data[ _SEG_BYTE[seg] ] & _SEG_MASK[seg]) != 0
+
+	def set_mask( self, mask ):
+		""" Set the 35 segments at once from an integer (bit n is the state of segment n) """
+		# bit j of payload byte b is the segment (b-1)+5*j
+		self.owner._busy += 1
+		try:
+			_d = self.data
+			for i in range( 1, 6 ):
+				_d[i] = 0
+			for j in range( 7 ):
+				_row = mask & 0x1F
+				mask >>= 5
+				if _row:
+					for i in range( 5 ):
+						if _row & (1<<i):
+							_d[i+1] |= 1<<j
+		finally:
+			self.owner._leave()
+
+	def get_mask( self ):
+		""" The 35 segments state as an integer (bit n is the state of segment n) """
+		_d = self.data
+		_mask = 0
+		for j in range( 6, -1, -1 ):
+			_row = 0
+			for i in range( 5 ):
+				if _d[i+1] & (1<<j):
+					_row |= 1<<i
+			_mask = (_mask << 5) | _row
+		return _mask
 
 	def update( self ):
 		""" Update the LCD @ char_index """
-		self.owner.send_cmd( self.data ) # Store display flags in the related RAM index
-		self.owner.display_digit( self.digit_idx, self.ram_idx ) # display the RAM idx character
+		_owner = self.owner
+		_owner._busy += 1
+		try:
+			_owner.write_char( self.ram_idx, self.data, 1 ) # Store display flags in the related RAM index (if changed)
+			_owner.display_digit( self.digit_idx, self.ram_idx ) # display the RAM idx character (if not yet displayed)
+		finally:
+			_owner._leave()
+
+	def queue_set( self, seg, value ):
+		""" set() then update() from an interrupt handler (see VFD_PT6302.irq_queue). Only for the
+		    DigitSegments created by attach_digit(), returns False otherwise. """
+		return self.owner.queue_segment( self.index, seg, value )
+
+	def queue_clear( self ):
+		""" clear() then update() from an interrupt handler (see queue_set) """
+		return self.owner.queue_clear( self.index )
+
+
+class TimerTask:
+	""" Call func() periodically from a machine.Timer (or on demand with schedule()). The timer
+	    interrupt only schedules the call with micropython.schedule(). A scheduled call may run
+	    while the main code is inside a driver call (sending a frame, updating the shadow): the
+	    call is then deferred until that driver call returns. """
+	def __init__( self, vfd, func ):
+		""" vfd: the VFD_PT6302 driver used by func. func: function without parameter """
+		self.vfd = vfd
+		self.func = func
+		self.pending = False # call deferred by a driver call in progress
+		self._timer = None
+		self._run_ref = self._run # bound method allocated once (micropython.schedule without allocation)
+		vfd._tasks.append( self )
+
+	def _run( self, _ ):
+		if self.vfd._busy:
+			self.pending = True
+			self.vfd._deferred = True
+			return
+		self.pending = False
+		self.func()
+
+	def schedule( self ):
+		""" Schedule a call of func() (allowed in hard IRQ). Returns False when the schedule queue is full """
+		try:
+			micropython.schedule( self._run_ref, 0 )
+		except RuntimeError:
+			return False
+		return True
+
+	def _timer_cb( self, timer ):
+		self.schedule()
+
+	def start( self, freq=None, period=None, timer_id=-1 ):
+		""" Call func() from a machine.Timer at freq Hz (or every period ms) """
+		from machine import Timer
+		self.stop()
+		self._timer = Timer( timer_id )
+		if period == None:
+			self._timer.init( mode=Timer.PERIODIC, freq=freq, callback=self._timer_cb )
+		else:
+			self._timer.init( mode=Timer.PERIODIC, period=period, callback=self._timer_cb )
+
+	def stop( self ):
+		""" Stop the Timer started with start() (a deferred call is cancelled) """
+		if self._timer != None:
+			self._timer.deinit()
+			self._timer = None
+		self.pending = False
+
+	def close( self ):
+		""" Stop the timer and unregister the task from the driver (no more call after it) """
+		self.stop()
+		if self in self.vfd._tasks:
+			self.vfd._tasks.remove( self )
+
+	@property
+	def running( self ):
+		return self._timer != None
+
+
+class Animation:
+	""" Page-flip animation of a digit: the frames are stored once in CGRAM slots and played by
+	    only rewriting the DCRAM pointer of the digit (2 bytes per frame). See VFD_PT6302.animation() """
+	def __init__( self, owner, position, frames, slots ):
+		assert 0 < len(frames) <= len(slots), "not enough RAM slots for the frames"
+		self.owner = owner # The VFD_PT6302 instance
+		self.position = position
+		self.slots = bytes( slots[:len(frames)] )
+		self.frames = frames
+		self.index = 0
+		self._task = TimerTask( owner, self.next ) # play() timer
+		self.upload()
+
+	def upload( self ):
+		""" Write the frames into the CGRAM slots (only the missing ones are sent) """
+		for i in range( len(self.slots) ):
+			_frame = self.frames[i]
+			if len( _frame ) == 7: # 7 rows of 5 bits (see define_char)
+				self.owner.define_char( self.slots[i], _frame )
+			else: # 5 columns bytes (see write_char)
+				self.owner.write_char( self.slots[i], _frame )
+
+	def show( self, index ):
+		""" Display a given frame """
+		self.index = index
+		self.owner.display_digit( self.position, self.slots[index] )
+
+	def next( self ):
+		""" Display the next frame """
+		_index = self.index + 1
+		if _index >= len( self.slots ):
+			_index = 0
+		self.show( _index )
+
+	def play( self, fps=10, timer_id=-1 ):
+		""" Play the animation from a machine.Timer at fps frames per second """
+		self._task.start( freq=fps, timer_id=timer_id )
+
+	def stop( self ):
+		""" Stop the Timer started with play() """
+		self._task.stop()
+
+	def close( self ):
+		""" Stop the animation and release its TimerTask (call it when the animation is discarded) """
+		self._task.close()
+
+
+def _reverse_bits( value ):
+	# Mirror the 8 bits of a byte (LSBF <-> MSBF)
+	_r = 0
+	for i in range( 8 ):
+		_r = (_r << 1) | ((value >> i) & 1)
+	return _r
+
+# Bit reversal table for SPI ports unable to shift LSB first (eg: rp2)
+_REVERSE = bytes( [ _reverse_bits(i) for i in range(256) ] )
+
+def char_columns( char_def, out=None, offset=0 ):
+	""" Transpose a 5 x 7 char (7 rows of 5 bits, see define_char) into the 5 column bytes
+	    of the PT6302 CGRAM (bit 0 = top row, bit 7 unused). The columns are stored in
+	    out[offset:offset+5] when out is given, otherwise a new bytearray is returned. """
+	if out == None:
+		out = bytearray( 5 )
+		offset = 0
+	for col in range( 5 ):
+		_mask = 0x10 >> col
+		_val = 0
+		for row in range( 7 ):
+			if char_def[row] & _mask:
+				_val |= 1 << row
+		out[offset+col] = _val
+	return out
+
+
+class PinTransport:
+	""" Bit-banging transport over the CLKB, DIN and CSB pins. A transport exposes a write(buf)
+	    method sending the buffer within a single CS frame. """
+	def __init__( self, sck, sdata, cs ):
+		self.sck = sck
+		self.sdata = sdata
+		self.cs = cs
+		self.cs.value( True ) # disable
+
+	def write( self, arr ):
+		# bit banging send of bytes/byteArray content (bit-banging)
+		self.cs.value( 0 ) # Active Low
+		for data in arr:
+			#print( data, bin(data) )
+			for i in range( 8 ): # LSBF
+				self.sck.value( 0 )
+				mask = 1<<i
+				self.sdata.value( (data & mask)==mask ) # set state of bit
+				#time.sleep_ms( 1 )
+				self.sck.value( 1 ) # rising edge for data acquisition
+				#time.sleep_ms( 1 )
+		self.cs.value( 1 )
+
+
+class SPITransport:
+	""" Hardware SPI transport, CSB is still handled by the transport.
+	    spi: machine.SPI in mode 3 (polarity=1, phase=1) with a baudrate under 1 MHz.
+	    lsb: set it to False when the SPI is configured MSB first (firstbit=SPI.MSB) because
+	    the port does not support SPI.LSB. The bytes are then reversed before being sent. """
+	def __init__( self, spi, cs, lsb=True ):
+		self.spi = spi
+		self.cs = cs
+		self._buf = bytearray( 1 )
+		self._rev = not( lsb )
+		self.cs.value( True ) # disable
+
+	def write( self, arr ):
+		# Bytes are written one by one because the PT6302 needs 8us of data
+		# processing time (tDOFF) between bytes
+		_buf = self._buf
+		self.cs.value( 0 ) # Active Low
+		for data in arr:
+			_buf[0] = _REVERSE[data] if self._rev else data
+			self.spi.write( _buf )
+		self.cs.value( 1 )
 
 
 class VFD_PT6302():
 	""" PT6302 Vaccum Fluorescent Display driver """
-	def __init__( self, sck, sdata, cs, reset=None, digits=15 ):
+	def __init__( self, sck, sdata, cs, reset=None, digits=15, spi=None, spi_lsb=True, transport=None, init=True ):
+		""" sck, sdata, cs: pins used by the bit-banging transport (PinTransport).
+		    spi: optional machine.SPI wired on sck/sdata, see SPITransport (sck, sdata can be None).
+		    spi_lsb: set it to False when the SPI is configured MSB first (see SPITransport).
+		    transport: optional object with a write(buf) method sending a buffer within a single
+		    CS frame (eg: vfd_pio.PIOTransport, vfd_emul.PT6302Emulator). It replaces the sck,
+		    sdata, cs pins (set them to None).
+		    init: set it to False to skip the reset and initialization commands (see init()),
+		    eg: when they are broadcasted to several chips by vfd_bus.PT6302Bus. """
 		self.sck = sck
 		self.sdata = sdata
 		self.cs = cs
 		self.reset = reset
 		self.digits = digits # Number of digits
-
-		self.cs.value( True ) # disable
+		if transport == None:
+			if spi != None:
+				transport = SPITransport( spi, cs, lsb=spi_lsb )
+			else:
+				transport = PinTransport( sck, sdata, cs )
+		self.transport = transport
+		self._frame = bytearray( 41 ) # command + 16 DCRAM data or 8x5 CGRAM data
+		_mv = memoryview( self._frame )
+		self._views = [ _mv[:n] for n in range(42) ] # frame views of each length (no allocation when sending)
+		self._byte = bytearray( 1 ) # scratch buffer for display_digit( position, int )
+		self._ctrl = bytearray( 8 ) # Control commands queued by batch(), indexed by command>>4
+		self._ctrl_mask = 0 # bit mask of the queued control commands
+		self._ctrl_state = bytearray( 8 ) # Last control command of each kind (sent again by resync)
+		self._ctrl_known = 0 # bit mask of the control commands in _ctrl_state
+		self._dcram_dirty = 0 # bit mask of the DCRAM addresses to send when leaving batch()
+		self._cgram_dirty = 0 # bit mask of the CGRAM chars to send when leaving batch()
+		self._batch = 0 # batch() nesting level
+		self._attached = [] # DigitSegments created by attach_digit()
+		self.refresher = None # vfd_async.Refresher flushing the changes (when used)
+		self._busy = 0 # driver calls in progress (the TimerTask calls are deferred until it returns to 0)
+		self._tasks = [] # TimerTask of the driver
+		self._deferred = False # a TimerTask call is pending
+		self._queue = None # IRQ queue records (see irq_queue)
+		self._q_head = 0 # next record applied by drain_queue()
+		self._q_tail = 0 # next record written by the interrupt handlers
+		self._q_auto = False # schedule drain_queue() when a record is queued
+		self._q_scheduled = False
+		self._drainer = TimerTask( self, self.drain_queue ) # scheduled drain_queue() calls
+		self.queue_overflow = 0 # records rejected because the queue was full
+		self._stats = [0]*_ST_SIZE # bus counters (see instrument), all zero until enabled
+		self._trace_len = 0 # no trace until instrument() is called
+		self._trace_pos = 0
+		self._trace_count = 0
+		self._dcram = bytearray( 16 ) # Shadow of the DCRAM (char code of each digit)
+		self._cgram = bytearray( 8*5 ) # Cache of the CGRAM (5 columns for RAM0..RAM7)
+		self.invalidate()
+		if init:
+			self.init()
+
+	def init( self ):
+		""" Reset the display (when the reset pin is given) and send the initialization commands """
 		if self.reset != None:
 			self.reset.value( False ) # Do reset
 			time.sleep_ms( 20 )
 			self.reset.value( True ) 
 			time.sleep_ms( 10 )
+			self.invalidate() # RAM content lost
 
 		self.output_port_set( True, False )
 		self.normal_operation()
@@ -88,26 +417,209 @@ class VFD_PT6302():
 		self.display_duty( 7 ) # 0: minimum brightness, 7: max brightness
 		self.clear()
 
+	def _leave( self ):
+		# End of a driver call (see _busy): run the TimerTask calls deferred meanwhile. They run
+		# before releasing the driver, so the calls scheduled in the mean time are deferred again
+		# (to the next driver call or timer tick). The counter is released even when a call fails.
+		try:
+			if self._deferred and (self._busy == 1):
+				self._deferred = False
+				_tasks = self._tasks
+				for i in range( len(_tasks)-1, -1, -1 ): # a task may close() itself
+					if i >= len( _tasks ):
+						continue
+					_task = _tasks[i]
+					if _task.pending:
+						_task.pending = False
+						try:
+							_task.func()
+						except:
+							self._deferred = True # the other pending calls run at the next driver call
+							raise
+		finally:
+			self._busy -= 1
+
 	def send( self, arr ):
-		# bit banging send of bytes/byteArray content (bit-banging)
-		self.cs.value( 0 ) # Active Low
-		for data in arr:
-			#print( data, bin(data) )
-			for i in range( 8 ): # LSBF
-				self.sck.value( 0 )
-				mask = 1<<i
-				self.sdata.value( (data & mask)==mask ) # set state of bit
-				#time.sleep_ms( 1 )
-				self.sck.value( 1 ) # rising edge for data acquisition
-				#time.sleep_ms( 1 )
-		self.cs.value( 1 )
+		# Send the bytes/byteArray content within a single CS frame.
+		# Data written with send() is not tracked by the DCRAM shadow (see invalidate)
+		self._busy += 1
+		try:
+			self.transport.write( arr )
+		finally:
+			self._leave()
+
+	def _send_instrumented( self, arr ):
+		# send() replacement when the instrumentation is enabled
+		self._busy += 1
+		try:
+			_start = _ticks_us()
+			self.transport.write( arr )
+			_stats = self._stats
+			_stats[_ST_US] += _ticks_diff( _ticks_us(), _start )
+			_op = arr[0] & 0xF0
+			_idx = _ST_DCRAM if _op == 0x10 else ( _ST_CGRAM if _op == 0x20 else _ST_CONTROL )
+			_stats[_idx] += 1
+			_stats[_idx+1] += len( arr )
+			if self._trace_len:
+				_pos = self._trace_pos
+				self._trace_ts[_pos] = _start
+				self._trace_cmd[_pos] = arr[0]
+				self._trace_size[_pos] = len( arr )
+				self._trace_pos = (_pos+1) % self._trace_len
+				self._trace_count += 1
+		finally:
+			self._leave()
+
+	def instrument( self, enabled=True, trace=16 ):
+		""" Enable (or disable) the bus counters and the trace of the last transactions.
+		    trace: size of the trace ring buffer (0 for no trace). No overhead when disabled. """
+		if not( enabled ):
+			try:
+				del self.send # back to the class method
+			except AttributeError:
+				pass
+			return
+		self._stats = [0]*_ST_SIZE
+		self._trace_len = trace
+		self._trace_ts = array( 'L', [0]*trace ) # ticks_us when the frame started
+		self._trace_cmd = bytearray( trace ) # command byte
+		self._trace_size = bytearray( trace ) # frame size (bytes)
+		self._trace_pos = 0
+		self._trace_count = 0
+		self.send = self._send_instrumented
+
+	def stats( self ):
+		""" Bus counters since instrument() was called: frames, bytes and us spent in send() with
+		    the frames/bytes breakdown for DCRAM, CGRAM and control commands """
+		_s = self._stats
+		return { 'frames' : _s[_ST_DCRAM]+_s[_ST_CGRAM]+_s[_ST_CONTROL],
+		         'bytes' : _s[_ST_DCRAM+1]+_s[_ST_CGRAM+1]+_s[_ST_CONTROL+1],
+		         'us' : _s[_ST_US],
+		         'dcram_frames' : _s[_ST_DCRAM], 'dcram_bytes' : _s[_ST_DCRAM+1],
+		         'cgram_frames' : _s[_ST_CGRAM], 'cgram_bytes' : _s[_ST_CGRAM+1],
+		         'control_frames' : _s[_ST_CONTROL], 'control_bytes' : _s[_ST_CONTROL+1] }
+
+	def trace( self ):
+		""" The last transactions (oldest first) as a list of (ticks_us, command_byte, size) """
+		_count = min( self._trace_count, self._trace_len )
+		_first = (self._trace_pos - _count) % self._trace_len if self._trace_len else 0
+		_r = []
+		for i in range( _count ):
+			_pos = (_first+i) % self._trace_len
+			_r.append( (self._trace_ts[_pos], self._trace_cmd[_pos], self._trace_size[_pos]) )
+		return _r
+
+	def invalidate( self ):
+		""" Forget the DCRAM shadow and CGRAM cache content. Next display_digit(), write_char()
+		    calls will be sent to the display """
+		self._dcram_valid = 0 # bit mask of the DCRAM addresses having a known content
+		self._cgram_valid = 0 # bit mask of the CGRAM chars having a known content
+
+	def resync( self ):
+		""" Send again the last control commands (ports, duty, digit length, all digits mode) and
+		    the known DCRAM and CGRAM content, eg: after frames dropped by a
+		    vfd_thread.ThreadedTransport or a chip reset not done by init(). The data written
+		    with send() is not restored. """
+		_known = self._ctrl_known
+		for i in range( 8 ):
+			if _known & (1<<i):
+				self._ctrl[i] = self._ctrl_state[i]
+		self._ctrl_mask |= _known
+		self._cgram_dirty |= self._cgram_valid
+		self._dcram_dirty |= self._dcram_valid
+		if not self._batch:
+			self.flush()
 
 	def send_cmd( self, val_or_list ):
-		# convert the given value or a list of value to bytes and send it to the lcd
-		if type(val_or_list) is list:
+		# Send a command (value) or a command followed by its data (list, bytes, bytearray,
+		# memoryview) to the lcd. DCRAM and CGRAM writes are tracked by the shadow/cache and
+		# queued within batch()
+		if type(val_or_list) is int:
+			self._control( val_or_list )
+			return
+		_cmd = val_or_list[0]
+		_op = _cmd & 0xF0
+		if _op == 0x10:
+			self._write_dcram( _cmd & 0x0F, val_or_list, 1, len(val_or_list), False )
+		elif _op == 0x20:
+			_ram = _cmd & 0x07
+			for i in range( 1, len(val_or_list)-4, 5 ):
+				self.write_char( _ram, val_or_list, i )
+				_ram = (_ram+1) & 0x07
+		elif len( val_or_list ) == 1:
+			self._control( _cmd )
+		elif type(val_or_list) is list:
 			self.send( bytes(val_or_list) )
 		else:
-			self.send( bytes([val_or_list]) )
+			self.send( val_or_list )
+
+	def _control( self, cmd ):
+		# Send a single byte control command (queued by batch(), only the last one of a kind is kept)
+		self._busy += 1
+		try:
+			self._ctrl_state[cmd >> 4] = cmd
+			self._ctrl_known |= 1 << (cmd >> 4)
+			if self._batch:
+				self._ctrl[cmd >> 4] = cmd
+				self._ctrl_mask |= 1 << (cmd >> 4)
+				return
+			self._frame[0] = cmd
+			self.send( self._views[1] )
+		finally:
+			self._leave()
+
+	def batch( self ):
+		""" Queue the commands and send them when leaving the with block. The DCRAM/CGRAM writes
+		    are merged in contiguous transfers.
+		    with vfd.batch():
+		        vfd.display_digit( 4, "Hello" )
+		        segments.update() """
+		return self
+
+	def __enter__( self ):
+		self._batch += 1
+		return self
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		self._batch -= 1
+		if self._batch == 0:
+			self.flush()
+		return False
+
+	def flush( self ):
+		""" Send the commands queued by batch(): control commands, then CGRAM and DCRAM writes """
+		self._busy += 1
+		try:
+			_mask = self._ctrl_mask
+			self._ctrl_mask = 0
+			for i in range( 8 ):
+				if _mask & (1<<i):
+					self._frame[0] = self._ctrl[i]
+					self.send( self._views[1] )
+			_dirty = self._cgram_dirty
+			self._cgram_dirty = 0
+			_ram = 0
+			while _ram < 8:
+				if _dirty & (1<<_ram):
+					_start = _ram
+					while (_ram < 8) and (_dirty & (1<<_ram)):
+						_ram += 1
+					self._send_cgram_run( _start, _ram-1 )
+				else:
+					_ram += 1
+			_dirty = self._dcram_dirty
+			self._dcram_dirty = 0
+			self._send_dcram( _dirty )
+		finally:
+			self._leave()
+
+	async def flushed( self ):
+		""" Wait until the pending changes are sent by the refresher (see vfd_async.Refresher).
+		    Without refresher, the pending changes are sent immediately. """
+		if self.refresher == None:
+			self.flush()
+			return
+		await self.refresher.flushed()
 
 
 	def cmd_all_digit( self, state ):
@@ -156,25 +668,86 @@ class VFD_PT6302():
 
 	def display_duty( self, duty ):
 		assert 1<=duty<=8
-		self.send( [0b01010000 | (duty-1)] )
+		self.send_cmd( 0b01010000 | (duty-1) )
 
 	def clear( self ):
-		self.display_digit( 1, list([0x20 for i in range(self.digits)]) )
+		self._write_dcram( 0, _SPACES, 0, self.digits, False )
 
 
-	def display_digit( self, position, data ):
-		# Display an integer(8bit) or string or list[int]
-		assert type(data) in (int,str,list)
+	def display_digit( self, position, data, force=False ):
+		""" Display an integer(8bit) or string (ASCII) or list[int], bytes, bytearray, memoryview
+		    from position (1..16). A shadow of the DCRAM is used to only send the changed chars
+		    (auto-increment mode, as few CS frames as possible). force=True rewrites the whole data. """
 		assert 1<=position<=16
-		_l = [ 0b00010000 | (position-1) ]
 		if type(data) is int:
 			assert data < 256
-			_l.append( data )
-		elif type(data) is list:
-			_l.extend( data )
-		else:
-			_l.extend( data.encode('ASCII') )
-		self.send_cmd( _l )
+			self._byte[0] = data
+			data = self._byte
+		self._write_dcram( position-1, data, 0, len(data), force )
+
+	def _write_dcram( self, addr, data, start, end, force ):
+		# Update the DCRAM shadow from addr with data[start:end] then send (or queue) the changes.
+		# str chars are converted with ord() (no str.encode() allocation).
+		self._busy += 1
+		try:
+			_shadow = self._dcram
+			_valid = self._dcram_valid
+			_str = type(data) is str
+			_dirty = 0
+			for i in range( start, end ):
+				code = ord( data[i] ) if _str else data[i]
+				if force or (_shadow[addr] != code) or not( _valid & (1<<addr) ):
+					_shadow[addr] = code
+					_dirty |= 1<<addr
+				addr = (addr+1) & 0x0F
+			self._dcram_valid = _valid | _dirty
+			if self._batch:
+				self._dcram_dirty |= _dirty
+			else:
+				self._send_dcram( _dirty )
+		finally:
+			self._leave()
+
+	def is_displayed( self, code ):
+		""" True when a char code is stored in the DCRAM shadow (within the digits length) """
+		_dcram = self._dcram
+		_valid = self._dcram_valid
+		for _addr in range( self.digits ):
+			if (_valid & (1<<_addr)) and (_dcram[_addr] == code):
+				return True
+		return False
+
+	def _send_dcram( self, dirty ):
+		# Send the dirty DCRAM addresses (bit mask) by runs. Runs separated by a few
+		# unchanged (and known) chars are merged to save CS frames.
+		_start = -1
+		_last = -1
+		for _addr in range( 16 ):
+			if not( dirty & (1<<_addr) ):
+				continue
+			if _start < 0:
+				_start = _addr
+			elif _addr-_last-1 > _DCRAM_GAP:
+				self._send_dcram_run( _start, _last )
+				_start = _addr
+			else:
+				_gap = ((1<<_addr)-1) ^ ((1<<(_last+1))-1) # addresses between _last and _addr
+				if (self._dcram_valid & _gap) != _gap:
+					self._send_dcram_run( _start, _last )
+					_start = _addr
+			_last = _addr
+		if _start >= 0:
+			self._send_dcram_run( _start, _last )
+
+	def _send_dcram_run( self, start, last ):
+		# Send the shadow DCRAM from address start to last (included) within a single CS frame
+		_len = last-start+1
+		_frame = self._frame
+		_dcram = self._dcram
+		_frame[0] = 0b00010000 | start
+		for i in range( _len ):
+			_frame[1+i] = _dcram[start+i]
+		self.send( self._views[_len+1] )
 
 
 	def define_char( self, ram_idx, char_def ):
@@ -183,23 +756,166 @@ class VFD_PT6302():
 		    [ 0b00000, 0b01010, 0b10101, 0b10001, 0b01010, 0b00100, 0b00000 ]  """
 		assert RAM0 <= ram_idx <= RAM7
 		assert (type(char_def) is list) and (len(char_def)==7), "char_def list must have 7 items of 5bits each"
-		_data = [ 0b00100000 | ram_idx ]
-		for bit_shift in range(4,-1,-1): # 4..0
-			_val = 0
-			bit_mask = 1 << bit_shift
-			for row in range(6,-1,-1): # 6..0
-				_val = _val + (1 if (char_def[row] & bit_mask)==bit_mask else 0)
-				
-				_val = _val << 1 # Bit 0 is not relevant
-
-			_val = _val >> 1 # For PT6302, it is the bit 7 that is not relevant
-			_data.append( _val )
-		self.send_cmd( _data )
-
-	def attach_digit( self, digit_idx, ram_idx ):
-		""" create a DigiSegments instance linked to a Digit position. the segments on/off are controled via the ram_idx custom characters """		
+		_data = char_columns( char_def )
+		self.write_char( ram_idx, _data )
+
+	def write_char( self, ram_idx, data, offset=0, force=False ):
+		""" Write the 5 columns bytes (PT6302 CGRAM format) of a RAM char from data[offset:offset+5].
+		    Nothing is sent when the RAM already contains that content (unless force=True). """
+		self._busy += 1
+		try:
+			_cache = self._cgram
+			_base = ram_idx*5
+			_changed = force or not( self._cgram_valid & (1<<ram_idx) )
+			for i in range( 5 ):
+				if _cache[_base+i] != data[offset+i]:
+					_cache[_base+i] = data[offset+i]
+					_changed = True
+			if not( _changed ):
+				return
+			self._cgram_valid |= 1<<ram_idx
+			if self._batch:
+				self._cgram_dirty |= 1<<ram_idx
+			else:
+				self._send_cgram_run( ram_idx, ram_idx )
+		finally:
+			self._leave()
+
+	def _send_cgram_run( self, start, last ):
+		# Send the cached CGRAM chars from RAM start to last (included) within a single CS frame
+		_len = (last-start+1)*5
+		_frame = self._frame
+		_cgram = self._cgram
+		_base = start*5
+		_frame[0] = 0b00100000 | start
+		for i in range( _len ):
+			_frame[1+i] = _cgram[_base+i]
+		self.send( self._views[_len+1] )
+
+	def attach_digit( self, digit_idx, ram_idx, check=True ):
+		""" create a DigiSegments instance linked to a Digit position. the segments on/off are controled via the ram_idx custom characters.
+		    check=False disables the segment number validation of DigitSegments.set() """		
 		assert 0<=digit_idx<=self.digits
 		assert RAM0 <= ram_idx <= RAM7
-		_segments = DigitSegments( self, digit_idx, ram_idx )
+		_segments = DigitSegments( self, digit_idx, ram_idx, check )
 		_segments.clear()
+		_segments.index = len( self._attached )
+		self._attached.append( _segments )
 		return _segments
+
+	def animation( self, position, frames, slots=None ):
+		""" Create a page-flip Animation of the digit at position (1..16). frames is a list of chars,
+		    each one defined with 7 rows (see define_char) or 5 columns bytes (see write_char).
+		    The frames are uploaded once in the slots (list of RAMx, RAM0.. by default). """
+		if slots == None:
+			slots = list( range(RAM0, RAM0+len(frames)) )
+		return Animation( self, position, frames, slots )
+
+	def update_segments( self ):
+		""" Call update() on all the DigitSegments created with attach_digit() """
+		for _segments in self._attached:
+			_segments.update()
+
+	def irq_queue( self, size=32, auto_drain=True ):
+		""" Allocate the queue of the commands sent from interrupt handlers (up to size-1 records).
+		    queue_segment(), queue_clear(), queue_digit() and queue_text() do not allocate memory,
+		    they are safe in hard IRQ. The commands are applied by drain_queue(), scheduled with
+		    micropython.schedule() when auto_drain=True (otherwise call it from the main loop).
+		    A scheduled drain is deferred while the main code is inside a driver call (see TimerTask). """
+		assert size >= 2
+		self._queue = bytearray( 4*size )
+		self._q_head = 0
+		self._q_tail = 0
+		self._q_auto = auto_drain and (micropython != None)
+
+	def _enqueue( self, op, a, b, c ):
+		# Store a record in the IRQ queue (no allocation), returns False when the queue is full.
+		# The arguments are checked by the queue_xxx() methods: drain_queue() applies them as is.
+		_q = self._queue
+		if _q == None: # irq_queue() not called
+			return False
+		_tail = self._q_tail
+		_next = _tail + 4
+		if _next == len( _q ):
+			_next = 0
+		if _next == self._q_head:
+			self.queue_overflow += 1
+			return False
+		_q[_tail] = op
+		_q[_tail+1] = a
+		_q[_tail+2] = b
+		_q[_tail+3] = c
+		self._q_tail = _next
+		if self._q_auto and not self._q_scheduled:
+			# schedule queue full: retried by the next record
+			self._q_scheduled = self._drainer.schedule()
+		return True
+
+	def queue_segment( self, index, seg, value ):
+		""" Queue a set( seg, value ) + update() of the attached DigitSegments #index (0 for the
+		    first attach_digit() call, ...). Returns False when the queue is full or the
+		    arguments are invalid (no exception in the interrupt handler). """
+		if not( 0 <= index < len(self._attached) ) or not( 0 <= seg <= 34 ):
+			return False
+		return self._enqueue( _Q_SEGMENT, index, seg, 1 if value else 0 )
+
+	def queue_clear( self, index ):
+		""" Queue a clear() + update() of the attached DigitSegments #index """
+		if not( 0 <= index < len(self._attached) ):
+			return False
+		return self._enqueue( _Q_CLEAR, index, 0, 0 )
+
+	def queue_digit( self, position, code ):
+		""" Queue the display of a char code (0..255) at position (1..16) """
+		if not( 1 <= position <= 16 ) or not( 0 <= code <= 255 ):
+			return False
+		return self._enqueue( _Q_DIGIT, position, code, 0 )
+
+	def queue_text( self, position, data ):
+		""" Queue the display of the bytes/bytearray data from position (1..16). A str would
+		    allocate memory: use bytes in hard IRQ. Returns False when the queue is full. """
+		if not( 1 <= position <= 16 ):
+			return False
+		for i in range( len(data) ):
+			if not self.queue_digit( ((position-1+i) & 0x0F)+1, data[i] ):
+				return False
+		return True
+
+	def drain_queue( self, _=None ):
+		""" Apply the commands queued by the interrupt handlers within a batch. Returns the
+		    number of applied commands. """
+		self._q_scheduled = False
+		_q = self._queue
+		if _q == None:
+			return 0
+		_count = 0
+		_touched = 0 # bit mask of the attached segments to update
+		_head = self._q_head
+		_tail = self._q_tail # records queued meanwhile are left to the next drain
+		with self.batch():
+			while _head != _tail:
+				_op = _q[_head]
+				_a = _q[_head+1]
+				_b = _q[_head+2]
+				_c = _q[_head+3]
+				_head += 4
+				if _head == len( _q ):
+					_head = 0
+				self._q_head = _head # free the record first: a failing record is not applied again
+				_count += 1
+				if _op == _Q_SEGMENT:
+					self._attached[_a].set( _b, _c )
+					_touched |= 1 << _a
+				elif _op == _Q_CLEAR:
+					self._attached[_a].clear()
+					_touched |= 1 << _a
+				else: # _Q_DIGIT
+					self._byte[0] = _b
+					self._write_dcram( _a-1, self._byte, 0, 1, False )
+			_i = 0
+			while _touched:
+				if _touched & 1:
+					self._attached[_i].update()
+				_touched >>= 1
+				_i += 1
+		return _count
@@ -0,0 +1,157 @@
+"""
+  vfd_thread.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It moves the bus traffic to a second thread (core 1 on the RP2040) so the driver
+          calls return without waiting for the frames to be shifted out.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import _thread
+import time
+try:
+	from micropython import const
+except ImportError: # CPython (host side tests with vfd_emul)
+	const = lambda x : x
+
+if hasattr( time, 'sleep_us' ): # MicroPython
+	_sleep_us = time.sleep_us
+else:
+	_sleep_us = lambda us : time.sleep( us / 1_000_000 )
+
+# Policies when the queue is full
+BLOCK = const(0) # write() waits for the worker (backpressure)
+DROP_OLDEST = const(1) # the oldest queued frames are discarded
+
+class ThreadedTransport:
+	""" Transport wrapper queuing the frames in a bounded ring buffer. A worker thread (started
+	    on core 1 with _thread) sends them with the wrapped transport, in the same order.
+	    write() only copies the frame under a lock, so it can be called from any thread.
+	    vfd = VFD_PT6302( None, None, None, transport=ThreadedTransport( PinTransport(sck, sdata, cs) ) ) """
+	def __init__( self, transport, size=512, policy=BLOCK, idle_us=100 ):
+		""" transport: the transport sending the frames (PinTransport, SPITransport, ...).
+		    size: ring buffer size in bytes (each frame uses its length + 1 byte).
+		    policy: BLOCK or DROP_OLDEST when the ring is full. idle_us: worker polling delay. """
+		assert policy in (BLOCK, DROP_OLDEST)
+		assert size >= 64
+		self.transport = transport
+		self.policy = policy
+		self.idle_us = idle_us
+		self.dropped = 0 # frames discarded by DROP_OLDEST
+		self._lost = 0 # dropped count at the last lost() call
+		self._ring = bytearray( size )
+		self._size = size
+		self._head = 0 # next byte read by the worker
+		self._count = 0 # bytes queued
+		self._lock = _thread.allocate_lock()
+		self._frame = bytearray( 256 ) # worker copy of the frame being sent
+		_view = memoryview( self._frame )
+		self._views = [ _view[0:i] for i in range(42) ] # driver frames (up to 41 bytes) without allocation
+		self._view = _view
+		self._busy = False # worker is sending a frame
+		self._running = True
+		_thread.start_new_thread( self._worker, () )
+
+	def _put( self, arr, pos ):
+		# Copy arr in the ring from pos (wrapping around) byte by byte (no slice copy), lock held
+		_ring = self._ring
+		_size = self._size
+		for i in range( len(arr) ):
+			_ring[pos] = arr[i]
+			pos += 1
+			if pos == _size:
+				pos = 0
+
+	def _get( self, pos, length ):
+		# Copy length bytes from the ring at pos (wrapping around) into the worker frame, lock held
+		_ring = self._ring
+		_frame = self._frame
+		_size = self._size
+		for i in range( length ):
+			_frame[i] = _ring[pos]
+			pos += 1
+			if pos == _size:
+				pos = 0
+
+	def _drop( self ):
+		# Discard the oldest frame, lock held
+		_len = self._ring[self._head] + 1
+		self._head = (self._head + _len) % self._size
+		self._count -= _len
+		self.dropped += 1
+
+	def write( self, arr ):
+		""" Queue the bytes/bytearray content, sent later as a single CS frame """
+		_len = len( arr )
+		if _len == 0:
+			return
+		assert _len <= 255, "frame too long"
+		_need = _len + 1
+		assert _need <= self._size, "frame larger than the ring buffer"
+		while True:
+			self._lock.acquire()
+			if self._size - self._count >= _need:
+				break
+			if self.policy == DROP_OLDEST:
+				while self._size - self._count < _need:
+					self._drop()
+				break
+			self._lock.release()
+			_sleep_us( self.idle_us ) # BLOCK: wait for the worker
+		_pos = (self._head + self._count) % self._size
+		self._ring[_pos] = _len
+		self._put( arr, (_pos+1) % self._size )
+		self._count += _need
+		self._lock.release()
+
+	def lost( self ):
+		""" True when frames were dropped since the last call. The display is then out of sync
+		    with the driver shadow, call vfd.resync() to send it again. """
+		_lost = self.dropped != self._lost
+		self._lost = self.dropped
+		return _lost
+
+	def pending( self ):
+		""" Bytes queued (including the length bytes), not yet sent """
+		return self._count
+
+	def wait( self ):
+		""" Wait until all the queued frames are sent """
+		while self._count or self._busy:
+			_sleep_us( self.idle_us )
+
+	def stop( self ):
+		""" Send the queued frames then stop the worker thread """
+		self.wait()
+		self._running = False
+
+	def _worker( self ):
+		while self._running:
+			self._lock.acquire()
+			if self._count == 0:
+				self._lock.release()
+				_sleep_us( self.idle_us )
+				continue
+			_len = self._ring[self._head]
+			self._get( (self._head+1) % self._size, _len )
+			self._head = (self._head + _len + 1) % self._size
+			self._count -= _len + 1
+			self._busy = True
+			self._lock.release()
+			self.transport.write( self._views[_len] if _len < 42 else self._view[0:_len] )
+			self._busy = False
@@ -0,0 +1,151 @@
+"""
+  vfd_viper.py is a micropython module for PT6302 VFD driver (Vaccum Fluorescent Display).
+          It contains an optimized bit-banging transport for boards without free SPI block.
+          On RP2040 the pins are driven through the SIO set/clear registers from viper code,
+          other ports use native code calling the Pin methods.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import micropython
+from micropython import const
+import sys
+import time
+from machine import Pin
+
+_SIO_OUT_SET = const(0xd0000014) # RP2040 GPIO_OUT_SET register
+_SIO_OUT_CLR = const(0xd0000018) # RP2040 GPIO_OUT_CLR register (other offsets on the RP2350)
+
+# Direct SIO register access only on the RP2040 (sys.platform is also 'rp2' on the RP2350)
+_RP2040 = (sys.platform == 'rp2') and ('RP2040' in getattr( sys.implementation, '_machine', '' ))
+
+@micropython.viper
+def _spin( count:int ):
+	# Busy wait loop (calibrated by ViperTransport)
+	while count > 0:
+		count -= 1
+
+@micropython.viper
+def _shift_rp2( buf, n:int, sck:int, sdata:int, cs:int, half:int, gap:int ):
+	# Send n bytes of buf LSB first. sck, sdata, cs are GPIO masks, half is the spin count for
+	# CLKB low/high time, gap the spin count for the data processing time between bytes.
+	_set = ptr32( _SIO_OUT_SET )
+	_clr = ptr32( _SIO_OUT_CLR )
+	_buf = ptr8( buf )
+	_clr[0] = cs # Active Low
+	d = half
+	while d > 0: # CSB setup time
+		d -= 1
+	i = 0
+	while i < n:
+		b = _buf[i]
+		j = 0
+		while j < 8:
+			_clr[0] = sck
+			if b & 1:
+				_set[0] = sdata
+			else:
+				_clr[0] = sdata
+			d = half # CLKB low + DIN setup time
+			while d > 0:
+				d -= 1
+			_set[0] = sck # rising edge for data acquisition
+			d = half # CLKB high + DIN hold time
+			while d > 0:
+				d -= 1
+			b = b >> 1
+			j += 1
+		d = gap # data processing time
+		while d > 0:
+			d -= 1
+		i += 1
+	d = gap # CSB hold time (2x data processing time)
+	while d > 0:
+		d -= 1
+	_set[0] = cs
+
+@micropython.native
+def _shift_pins( buf, n:int, sck, sdata, cs, half:int, gap_us:int ):
+	# Send n bytes of buf LSB first with the Pin methods. half is the spin count for CLKB
+	# low/high time, gap_us the data processing time between bytes.
+	cs.off() # Active Low
+	for i in range( n ):
+		b = buf[i]
+		for j in range( 8 ):
+			sck.off()
+			if b & 1:
+				sdata.on()
+			else:
+				sdata.off()
+			_spin( half ) # CLKB low + DIN setup time
+			sck.on() # rising edge for data acquisition
+			_spin( half ) # CLKB high + DIN hold time
+			b >>= 1
+		time.sleep_us( gap_us ) # data processing time
+	time.sleep_us( gap_us ) # CSB hold time (2x data processing time)
+	cs.on()
+
+
+class ViperTransport:
+	""" Optimized bit-banging transport (same wiring as vfd_pt63.PinTransport). On the RP2040,
+	    the pins are driven with the SIO registers, the other ports use the Pin methods.
+	    sck, sdata, cs : GPIO numbers (or Pin objects on non RP2040 ports).
+	    half_ns : CLKB low and high time (PT6302: tCW, tDS, tDH >= 300ns, CLKB cycle >= 1us).
+	    gap_us : pause between bytes (PT6302: tDOFF >= 8us, CSB hold tCSH >= 16us = 2x gap). """
+	def __init__( self, sck, sdata, cs, half_ns=500, gap_us=8 ):
+		assert half_ns >= 300 and gap_us >= 8, "out of PT6302 timings"
+		self._rp2 = _RP2040
+		self.sck = sck if isinstance(sck, Pin) else Pin( sck, Pin.OUT, value=True )
+		self.sdata = sdata if isinstance(sdata, Pin) else Pin( sdata, Pin.OUT )
+		self.cs = cs if isinstance(cs, Pin) else Pin( cs, Pin.OUT, value=True )
+		self.cs.value( True ) # disable
+		self.bits = 0 # bits sent
+		self.us = 0 # time spent in write()
+		self._gap_us = gap_us
+		_per_us = self.calibrate()
+		self._half = (half_ns * _per_us + 999) // 1000
+		self._gap = gap_us * _per_us
+		if self._rp2:
+			assert type(sck) is int and type(sdata) is int and type(cs) is int, "RP2040 needs GPIO numbers"
+			self._masks = ( 1<<sck, 1<<sdata, 1<<cs )
+
+	def calibrate( self, count=20000 ):
+		""" Number of spin loop per micro-second """
+		_start = time.ticks_us()
+		_spin( count )
+		_elapsed = time.ticks_diff( time.ticks_us(), _start )
+		return max( 1, (count + _elapsed - 1) // max( 1, _elapsed ) )
+
+	def write( self, arr ):
+		# Send the bytes/bytearray/memoryview content within a single CS frame
+		_n = len( arr )
+		_start = time.ticks_us()
+		if self._rp2:
+			_sck, _sdata, _cs = self._masks
+			_shift_rp2( arr, _n, _sck, _sdata, _cs, self._half, self._gap )
+		else:
+			_shift_pins( arr, _n, self.sck, self.sdata, self.cs, self._half, self._gap_us )
+		self.us += time.ticks_diff( time.ticks_us(), _start )
+		self.bits += _n*8
+
+	def bitrate( self ):
+		""" Measured bit rate (bits per second) including the CS framing and byte gaps """
+		if self.us == 0:
+			return 0
+		return self.bits * 1000000 // self.us
@@ -0,0 +1,45 @@
+"""
+  anim_intro.py is an example of animation source for tools/vfd_animc.py:
+     python3 tools/vfd_animc.py tools/anim_intro.py intro.pta
+  then copy intro.pta on the board and play it (see examples/test_anim_file.py).
+
+  A bar grows from the bottom of each digit (custom chars RAM0..RAM6), the title is then
+  revealed char by char and the brightness pulses.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+TITLE = "PT6302 VFD  "
+
+# RAM0..RAM6: bar of 1 to 7 rows (7 rows of 5 bits, row 0 on top)
+BARS = { ram : [ 0b00000 if row < 6-ram else 0b11111 for row in range(7) ] for ram in range(7) }
+
+FRAMES = [ { 'ms' : 50, 'chars' : BARS, 'text' : [ (1, " "*16) ], 'duty' : 8 } ]
+# The bars grow from left to right
+for step in range( 7+11 ):
+	_levels = bytes( [ min( max(step-col, 0), 6 ) for col in range(12) ] )
+	FRAMES.append( { 'ms' : 40, 'text' : [ (4, _levels) ] } )
+# Reveal the title
+for col in range( len(TITLE) ):
+	FRAMES.append( { 'ms' : 60, 'text' : [ (4+col, TITLE[col]) ] } )
+# Brightness pulse
+for duty in ( 7, 6, 5, 4, 3, 4, 5, 6, 7, 8 ):
+	FRAMES.append( { 'ms' : 80, 'duty' : duty } )
+FRAMES.append( { 'ms' : 1000 } )
@@ -0,0 +1,53 @@
+"""
+  font_latin.py is the source of the vfd_glyph.py font: accented chars (French/Dutch) and icons.
+
+  Each glyph is defined with 7 rows of 5 bits (see VFD_PT6302.define_char). Compile it with
+     python3 tools/vfd_fontc.py tools/font_latin.py
+  and paste the output in lib/vfd_glyph.py.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+GLYPHS = {
+	'é' : [ 0b00010, 0b00100, 0b01110, 0b10001, 0b11111, 0b10000, 0b01110 ],
+	'è' : [ 0b01000, 0b00100, 0b01110, 0b10001, 0b11111, 0b10000, 0b01110 ],
+	'ê' : [ 0b00100, 0b01010, 0b01110, 0b10001, 0b11111, 0b10000, 0b01110 ],
+	'ë' : [ 0b01010, 0b00000, 0b01110, 0b10001, 0b11111, 0b10000, 0b01110 ],
+	'à' : [ 0b01000, 0b00100, 0b01110, 0b00001, 0b01111, 0b10001, 0b01111 ],
+	'â' : [ 0b00100, 0b01010, 0b01110, 0b00001, 0b01111, 0b10001, 0b01111 ],
+	'ä' : [ 0b01010, 0b00000, 0b01110, 0b00001, 0b01111, 0b10001, 0b01111 ],
+	'î' : [ 0b00100, 0b01010, 0b01100, 0b00100, 0b00100, 0b00100, 0b01110 ],
+	'ï' : [ 0b01010, 0b00000, 0b01100, 0b00100, 0b00100, 0b00100, 0b01110 ],
+	'ô' : [ 0b00100, 0b01010, 0b01110, 0b10001, 0b10001, 0b10001, 0b01110 ],
+	'ö' : [ 0b01010, 0b00000, 0b01110, 0b10001, 0b10001, 0b10001, 0b01110 ],
+	'ù' : [ 0b01000, 0b00100, 0b10001, 0b10001, 0b10001, 0b10011, 0b01101 ],
+	'û' : [ 0b00100, 0b01010, 0b10001, 0b10001, 0b10001, 0b10011, 0b01101 ],
+	'ü' : [ 0b01010, 0b00000, 0b10001, 0b10001, 0b10001, 0b10011, 0b01101 ],
+	'ç' : [ 0b00000, 0b01110, 0b10000, 0b10000, 0b01110, 0b00100, 0b01000 ],
+	'É' : [ 0b00010, 0b11111, 0b10000, 0b11110, 0b10000, 0b10000, 0b11111 ],
+	'È' : [ 0b01000, 0b11111, 0b10000, 0b11110, 0b10000, 0b10000, 0b11111 ],
+	'À' : [ 0b01000, 0b01110, 0b10001, 0b10001, 0b11111, 0b10001, 0b10001 ],
+	'Ç' : [ 0b01110, 0b10001, 0b10000, 0b10000, 0b10001, 0b01110, 0b00100 ],
+	'°' : [ 0b01100, 0b10010, 0b10010, 0b01100, 0b00000, 0b00000, 0b00000 ],
+	'€' : [ 0b00111, 0b01000, 0b11110, 0b01000, 0b11110, 0b01000, 0b00111 ],
+	'♥' : [ 0b00000, 0b01010, 0b11111, 0b11111, 0b01110, 0b00100, 0b00000 ],
+	'→' : [ 0b00000, 0b00100, 0b00010, 0b11111, 0b00010, 0b00100, 0b00000 ],
+	'←' : [ 0b00000, 0b00100, 0b01000, 0b11111, 0b01000, 0b00100, 0b00000 ],
+}
@@ -0,0 +1,111 @@
+"""
+  vfd_animc.py compiles an animation described in Python into the vfd_anim.py file format
+  (played on the board with vfd_anim.AnimationPlayer).
+
+  Runs on a computer (CPython):  python3 tools/vfd_animc.py source.py output.pta
+
+  source.py must declare a FRAMES list, each frame is a dictionnary with the optional keys:
+    'ms'    : duration of the frame in milliseconds (100 by default)
+    'text'  : list of (position, text) written from position (1..16), text is a str or bytes
+    'chars' : dictionnary RAMx -> char, 7 rows (see define_char) or 5 columns (see write_char)
+    'duty'  : brightness 1..8 (see display_duty)
+    'raw'   : list of raw commands (list of bytes values) sent as is
+  Only the changes (DCRAM deltas, modified custom chars, duty) are stored in the frames.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import sys
+
+sys.path.insert( 0, (__file__.rsplit('/',1)[0] if '/' in __file__ else '.') + '/../lib' )
+
+from vfd_pt63 import char_columns
+from vfd_anim import MAGIC
+
+_DCRAM_GAP = 2 # Unchanged chars resent to merge two DCRAM runs (see vfd_pt63)
+
+def _runs( changed, known, size, gap ):
+	# Group the changed addresses (list of bool) in (start, last) runs, merging the runs
+	# separated by up to gap known addresses
+	_runs = []
+	for _addr in range( size ):
+		if not changed[_addr]:
+			continue
+		if _runs and (_addr-_runs[-1][1]-1 <= gap) and all( known[_runs[-1][1]+1:_addr] ):
+			_runs[-1][1] = _addr
+		else:
+			_runs.append( [_addr, _addr] )
+	return _runs
+
+def compile_frames( frames ):
+	""" Compile the FRAMES list into the bytes of an animation file """
+	_dcram = [None]*16 # display state after the previous frame
+	_cgram = [None]*8
+	_duty = None
+	_out = bytearray( MAGIC )
+	_out += len( frames ).to_bytes( 2, 'little' )
+	for _frame in frames:
+		_cmds = []
+		for _raw in _frame.get( 'raw', [] ):
+			_cmds.append( bytes(_raw) )
+		if ('duty' in _frame) and (_frame['duty'] != _duty):
+			_duty = _frame['duty']
+			assert 1 <= _duty <= 8
+			_cmds.append( bytes([0b01010000 | (_duty-1)]) )
+		# CGRAM: modified chars, contiguous RAMs in a single command
+		_new = list( _cgram )
+		for _ram, _char in _frame.get( 'chars', {} ).items():
+			_new[_ram] = bytes( char_columns(_char) if len(_char) == 7 else _char )
+		_changed = [ _new[i] != _cgram[i] for i in range(8) ]
+		for _start, _last in _runs( _changed, [False]*8, 8, 0 ):
+			_cmds.append( bytes([0b00100000 | _start]) + b''.join( _new[_start:_last+1] ) )
+		_cgram = _new
+		# DCRAM: changed chars, close runs merged
+		_new = list( _dcram )
+		for _pos, _text in _frame.get( 'text', [] ):
+			for i in range( len(_text) ):
+				_new[(_pos-1+i) & 0x0F] = ord( _text[i] ) if type(_text) is str else _text[i]
+		_changed = [ _new[i] != _dcram[i] for i in range(16) ]
+		_known = [ _v != None for _v in _new ]
+		for _start, _last in _runs( _changed, _known, 16, _DCRAM_GAP ):
+			_cmds.append( bytes([0b00010000 | _start] + _new[_start:_last+1]) )
+		_dcram = _new
+		_out += _frame.get( 'ms', 100 ).to_bytes( 2, 'little' )
+		_out.append( len(_cmds) )
+		for _cmd in _cmds:
+			assert len( _cmd ) <= 64
+			_out.append( len(_cmd) )
+			_out += _cmd
+	return bytes( _out )
+
+def load_frames( path ):
+	""" The FRAMES list declared in the python file """
+	_names = {}
+	with open( path, encoding='utf8' ) as f:
+		exec( f.read(), _names )
+	return _names['FRAMES']
+
+if __name__ == '__main__':
+	if len( sys.argv ) < 3:
+		print( __doc__ )
+		sys.exit( 1 )
+	_data = compile_frames( load_frames(sys.argv[1]) )
+	with open( sys.argv[2], 'wb' ) as f:
+		f.write( _data )
+	print( "%s: %i bytes" % (sys.argv[2], len(_data)) )
@@ -0,0 +1,195 @@
+"""
+  vfd_bench.py is a benchmark of the PT6302 VFD driver hot paths (vfd_pt63 and vfd_proximus).
+
+  Runs on a computer (CPython):  python3 tools/vfd_bench.py [iterations]
+  Runs on the board (MicroPython): copy the file then "import vfd_bench" (or mpremote run)
+
+  Pins are mocked (counting toggles) so no display is needed. For each hot path the
+  benchmark reports, per call: bytes on the wire, CS frames, pin toggles, heap allocation
+  (bytes) and wall time (micro-seconds). The heap figure only checks the allocation free
+  paths on MicroPython: CPython also counts its own objects (ints, frames), it is indicative.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import sys
+import gc
+import time
+
+try: # CPython: add the repository lib/ folder
+	sys.path.insert( 0, (__file__.rsplit('/',1)[0] if '/' in __file__ else '.') + '/../lib' )
+except NameError: # no __file__ on the board
+	pass
+
+from vfd_pt63 import VFD_PT6302, PinTransport, RAM0, RAM7
+from vfd_proximus import VFD_Proximus, CLOCK
+from vfd_font import Font, compile_font
+
+if hasattr( time, 'ticks_us' ): # MicroPython
+	_now_us = time.ticks_us
+	_diff_us = time.ticks_diff
+else:
+	_now_us = lambda : time.perf_counter_ns() // 1000
+	_diff_us = lambda end, start : end - start
+
+try:
+	import tracemalloc # CPython
+except ImportError:
+	tracemalloc = None
+
+
+class CountingPin:
+	""" Mocked output Pin counting the toggles """
+	def __init__( self ):
+		self.state = 0
+		self.toggles = 0
+
+	def value( self, v=None ):
+		if v == None:
+			return self.state
+		v = 1 if v else 0
+		if v != self.state:
+			self.toggles += 1
+			self.state = v
+
+
+class BenchTransport( PinTransport ):
+	""" Bit-banging transport on mocked pins, counting bytes and CS frames """
+	def __init__( self ):
+		self.pins = ( CountingPin(), CountingPin(), CountingPin() )
+		super().__init__( *self.pins )
+		self.reset()
+
+	def reset( self ):
+		self.frames = 0
+		self.bytes = 0
+		for _pin in self.pins:
+			_pin.toggles = 0
+
+	def write( self, arr ):
+		self.frames += 1
+		self.bytes += len( arr )
+		super().write( arr )
+
+	def toggles( self ):
+		return sum( [ _pin.toggles for _pin in self.pins ] )
+
+
+def _heap_pass( fn, iterations ):
+	# Bytes allocated by the iterations calls of fn. On MicroPython, gc.mem_alloc() grows
+	# with every allocation while the collector is disabled. On CPython, tracemalloc only
+	# reports live memory: add the peak over the baseline of each call.
+	gc.collect()
+	if tracemalloc != None:
+		tracemalloc.start()
+		_total = 0
+		for i in range( iterations ):
+			_base = tracemalloc.get_traced_memory()[0]
+			tracemalloc.reset_peak()
+			fn( i )
+			_total += tracemalloc.get_traced_memory()[1] - _base
+		tracemalloc.stop()
+		return _total
+	gc.disable()
+	_start = gc.mem_alloc()
+	for i in range( iterations ):
+		fn( i )
+	_used = gc.mem_alloc() - _start
+	gc.enable()
+	return _used
+
+def measure( name, transport, fn, iterations ):
+	""" Call fn(i) for i in range(iterations) and return the per call results.
+	    The heap is measured in a second pass (tracemalloc slows down CPython). """
+	fn( 0 ) # warm-up (caches, tables)
+	fn( 1 )
+	transport.reset()
+	_start = _now_us()
+	for i in range( iterations ):
+		fn( i )
+	_elapsed = _diff_us( _now_us(), _start )
+	_bytes, _frames, _toggles = transport.bytes, transport.frames, transport.toggles()
+	_heap = _heap_pass( fn, iterations )
+	return ( name, _bytes/iterations, _frames/iterations, _toggles/iterations, _heap/iterations, _elapsed/iterations )
+
+def run( iterations=200 ):
+	""" Run all the benchmarks and print the results """
+	_t = BenchTransport()
+	vfd = VFD_PT6302( None, None, None, transport=_t )
+	_seg = vfd.attach_digit( 3, RAM7 )
+	_glyphs = ( [ 0b00000, 0b01010, 0b10101, 0b10001, 0b01010, 0b00100, 0b00000 ],
+	            [ 0b00100, 0b01110, 0b11111, 0b01110, 0b00100, 0b00000, 0b00000 ] )
+	_font = Font( *compile_font( { 'a' : _glyphs[0], 'b' : _glyphs[1] } ) )
+	_texts = ( "Hello World!", "Hello Wirld?" )
+
+	_tp = BenchTransport()
+	prox = VFD_Proximus( None, None, None, transport=_tp )
+	prox.right.disc_start()
+
+	def _display_digit( i ):
+		vfd.display_digit( 4, _texts[i & 1] )
+
+	def _define_char( i ):
+		vfd.define_char( RAM0 + (i & 1), _glyphs[(i >> 1) & 1] )
+
+	def _font_upload( i ):
+		_font.upload( vfd, RAM0 + (i & 1), 'ab'[(i >> 1) & 1] )
+
+	def _segments_update( i ):
+		_seg.set( i % 35, (i & 1) == 0 )
+		_seg.update()
+
+	def _panel_int( i ):
+		prox.left.int( i % 20000 )
+		prox.left.update()
+
+	def _panel_float( i ):
+		prox.center.float( (i % 20000) / 100 )
+		prox.center.update()
+
+	def _disc_step( i ):
+		prox.right.disc_step()
+		prox.right.update()
+
+	def _proximus_update( i ):
+		if i & 1:
+			prox.options.add( CLOCK )
+		else:
+			prox.options.discard( CLOCK )
+		prox.update()
+
+	_results = [
+		measure( "display_digit", _t, _display_digit, iterations ),
+		measure( "define_char", _t, _define_char, iterations ),
+		measure( "Font.upload", _t, _font_upload, iterations ),
+		measure( "DigitSegments.update", _t, _segments_update, iterations ),
+		measure( "DigitalPanel.int", _tp, _panel_int, iterations ),
+		measure( "DigitalPanel.float", _tp, _panel_float, iterations ),
+		measure( "DiskPanel.disc_step", _tp, _disc_step, iterations ),
+		measure( "VFD_Proximus.update", _tp, _proximus_update, iterations ) ]
+	print( "%-22s %8s %8s %9s %9s %9s" % ("per call", "bytes", "frames", "toggles",
+	       "heap(B)" if tracemalloc == None else "heap(B)*", "time(us)") )
+	for _r in _results:
+		print( "%-22s %8.1f %8.2f %9.1f %9.1f %9.1f" % _r )
+	if tracemalloc != None:
+		print( "* CPython tracemalloc, indicative only (counts objects MicroPython does not allocate)" )
+	return _results
+
+if __name__ == '__main__':
+	run( int(sys.argv[1]) if len(sys.argv) > 1 else 200 )
@@ -0,0 +1,46 @@
+"""
+  vfd_fontc.py compiles a 5x7 font defined by rows (see VFD_PT6302.define_char) into the
+  precompiled vfd_font.Font format (glyphs stored in the PT6302 CGRAM column order).
+
+  Runs on a computer (CPython):  python3 tools/vfd_fontc.py source.py [NAME]
+
+  source.py must declare a GLYPHS dictionnary (char -> 7 rows). The Python source of the
+  Font named NAME (FONT by default) is printed on the standard output.
+
+The MIT License (MIT)
+Copyright (c) 2024 Dominique Meurisse, support@mchobby.be, shop.mchobby.be
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+import sys
+
+sys.path.insert( 0, (__file__.rsplit('/',1)[0] if '/' in __file__ else '.') + '/../lib' )
+
+from vfd_font import font_source
+
+def load_glyphs( path ):
+	""" The GLYPHS dictionnary declared in the python file """
+	_names = {}
+	with open( path, encoding='utf8' ) as f:
+		exec( f.read(), _names )
+	return _names['GLYPHS']
+
+if __name__ == '__main__':
+	if len( sys.argv ) < 2:
+		print( __doc__ )
+		sys.exit( 1 )
+	sys.stdout.write( font_source( load_glyphs(sys.argv[1]), sys.argv[2] if len(sys.argv) > 2 else 'FONT' ) )